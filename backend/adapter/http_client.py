@@ -0,0 +1,105 @@
+import importlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from backend.config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+# ``inproc://package.module:app/path`` calls the ASGI app in this process instead of a socket
+INPROC_SCHEME = "inproc"
+INPROC_HOST = "inproc.local"
+
+
+class HTTPClientPool:
+    """
+    Long-lived ``httpx.AsyncClient`` instances shared by the whole process.
+
+    One client (and therefore one connection pool) is kept per origin so the
+    connection limits in ``config/app-*.yaml`` apply per host, and keep-alive
+    connections are reused across requests and prompts.
+
+    ``inproc://module:app`` origins get a client bound to that ASGI app through
+    ``httpx.ASGITransport``; the module must start with one of the configured
+    ``inproc_modules`` prefixes.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.inproc_modules = tuple(self.config.get("inproc_modules") or ("mcp_servers.",))
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the host of ``url``, creating it on first use."""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = self._create_inproc_client(url) if self.is_inproc(url) else self._create_client()
+            self._clients[origin] = client
+        return client
+
+    def resolve(self, url: str) -> Tuple[httpx.AsyncClient, str]:
+        """
+        The client for ``url`` and the URL to request with it. ``inproc://`` URLs
+        are rewritten to plain HTTP URLs that the in-process transport accepts.
+        """
+        client = self.client_for(url)
+        if not self.is_inproc(url):
+            return client, url
+        parts = urlsplit(url)
+        return client, urlunsplit(("http", INPROC_HOST, parts.path or "/", parts.query, ""))
+
+    @staticmethod
+    def is_inproc(url: str) -> bool:
+        return urlsplit(url).scheme == INPROC_SCHEME
+
+    def _create_inproc_client(self, url: str) -> httpx.AsyncClient:
+        module_name, _, attribute = urlsplit(url).netloc.partition(":")
+        if not module_name.startswith(self.inproc_modules):
+            raise ValueError(f"Module '{module_name}' is not allowed for in-process calls")
+        app = getattr(importlib.import_module(module_name), attribute or "app")
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=f"http://{INPROC_HOST}")
+
+    def _create_client(self) -> httpx.AsyncClient:
+        timeout_cfg = self.config.get("timeout") or {}
+        timeout = httpx.Timeout(
+            connect=timeout_cfg.get("connect", 5),
+            read=timeout_cfg.get("read", 20),
+            write=timeout_cfg.get("write", 20),
+            pool=timeout_cfg.get("pool", 5),
+        )
+        limits = httpx.Limits(
+            max_connections=self.config.get("max_connections_per_host", 20),
+            max_keepalive_connections=self.config.get("max_keepalive_connections", 10),
+            keepalive_expiry=self.config.get("keepalive_expiry", 30),
+        )
+        return httpx.AsyncClient(timeout=timeout, limits=limits, http2=self._http2_enabled())
+
+    def _http2_enabled(self) -> bool:
+        if not self.config.get("http2"):
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            return False
+        return True
+
+    async def aclose(self):
+        """Close every pooled client. Called on application shutdown."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+http_client_pool = HTTPClientPool(settings.http_client)
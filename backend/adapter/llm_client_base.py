@@ -1,8 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 
 class LLMClient(ABC):
     @abstractmethod
     def complete(self, prompt: str, context: Dict[str, Any]) -> str:
         pass
 
+    @abstractmethod
+    async def acomplete(self, prompt: str, context: Dict[str, Any]) -> str:
+        """Non-blocking variant of ``complete`` for use inside the event loop."""
+        pass
+
+    async def astream(self, prompt: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield the completion incrementally. Clients without streaming support yield it in one piece."""
+        yield await self.acomplete(prompt, context)
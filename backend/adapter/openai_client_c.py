@@ -1,28 +1,35 @@
-from openai import OpenAI
-
 from backend.adapter.llm_client_base import LLMClient
-from typing import Dict, Any
+from backend.adapter.openai_clients import get_async_openai_client, get_openai_client
+from typing import Dict, Any, List
 
 
 class OpenAIClientC(LLMClient):
     def __init__(self, api_key: str):
         self.api_key = api_key
 
-    def complete(self, prompt: str, context: Dict[str, Any]) -> str:
-        messages = [
+    @staticmethod
+    def _build_messages(prompt: str, context: Dict[str, Any]) -> List[Dict[str, str]]:
+        return [
             {"role": "system", "content": context.get("system", "")},
             {"role": "user", "content": prompt}
         ]
-        client = OpenAI(api_key=self.api_key)
+
+    def complete(self, prompt: str, context: Dict[str, Any]) -> str:
+        client = get_openai_client(self.api_key)
         response = client.chat.completions.create(
             model="text-davinci-003",
-            messages=[
-                {"role": "system", "content": "..."},
-                {"role": "user", "content": "..."}
-            ],
+            messages=self._build_messages(prompt, context),
             temperature=0,
             max_tokens=800
         )
         return response.choices[0].message.content.strip()
 
-
+    async def acomplete(self, prompt: str, context: Dict[str, Any]) -> str:
+        client = get_async_openai_client(self.api_key)
+        response = await client.chat.completions.create(
+            model="text-davinci-003",
+            messages=self._build_messages(prompt, context),
+            temperature=0,
+            max_tokens=800
+        )
+        return response.choices[0].message.content.strip()
@@ -0,0 +1,32 @@
+from typing import Dict
+
+from openai import AsyncOpenAI, OpenAI
+
+
+# One SDK client per API key, so its connection pool is reused across calls
+_sync_clients: Dict[str, OpenAI] = {}
+_async_clients: Dict[str, AsyncOpenAI] = {}
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    client = _sync_clients.get(api_key)
+    if client is None:
+        client = _sync_clients[api_key] = OpenAI(api_key=api_key)
+    return client
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    client = _async_clients.get(api_key)
+    if client is None:
+        client = _async_clients[api_key] = AsyncOpenAI(api_key=api_key)
+    return client
+
+
+async def close_openai_clients():
+    """Release the pooled SDK clients. Called on application shutdown."""
+    for client in list(_async_clients.values()):
+        await client.close()
+    for client in list(_sync_clients.values()):
+        client.close()
+    _async_clients.clear()
+    _sync_clients.clear()
@@ -0,0 +1,202 @@
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from backend.config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+STDIO_SCHEME = "stdio"
+# Large enough for array results on a single line
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+class StdioRPCError(Exception):
+    """Raised when a stdio MCP server answers with a JSON-RPC error or dies mid-request."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        # JSON-RPC error code sent by the server; None when the process never answered
+        self.code = code
+
+
+class StdioProcess:
+    """
+    One long-lived server subprocess speaking line-delimited JSON-RPC 2.0 on
+    stdin/stdout. Requests are multiplexed by id, so many can be in flight at once.
+    """
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._write_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def load(self) -> int:
+        return len(self._pending)
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=LINE_LIMIT,
+        )
+        self._tasks = [asyncio.create_task(self._read_responses()), asyncio.create_task(self._drain_stderr())]
+        logger.info("Started stdio MCP server %s (pid %s)", " ".join(self.command), self._process.pid)
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]], timeout: float) -> Any:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        try:
+            async with self._write_lock:
+                self._process.stdin.write((json.dumps(message) + "\n").encode())
+                await self._process.stdin.drain()
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_responses(self):
+        try:
+            while True:
+                line = await self._process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning("Ignoring non JSON-RPC output from %s: %r", self.command, line[:200])
+                    continue
+                future = self._pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    error = message["error"] or {}
+                    future.set_exception(StdioRPCError(error.get("message") or str(error), error.get("code")))
+                else:
+                    future.set_result(message.get("result"))
+        finally:
+            # The process is gone: fail everything still waiting so callers can retry elsewhere
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(StdioRPCError("MCP stdio server exited"))
+
+    async def _drain_stderr(self):
+        while True:
+            line = await self._process.stderr.readline()
+            if not line:
+                break
+            logger.debug("[%s] %s", self.command[-2], line.decode(errors="replace").rstrip())
+
+    async def close(self):
+        if self.alive:
+            self._process.stdin.close()
+            try:
+                await asyncio.wait_for(self._process.wait(), 2)
+            except asyncio.TimeoutError:
+                self._process.kill()
+                await self._process.wait()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class StdioProcessPool:
+    """``size`` processes of one server; each request goes to the least loaded live one."""
+
+    def __init__(self, command: List[str], size: int, restart_backoff: float):
+        self.command = command
+        self.processes = [StdioProcess(command) for _ in range(size)]
+        self.restart_backoff = restart_backoff
+        self._restarted_at: Dict[int, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> StdioProcess:
+        async with self._lock:
+            live = [process for process in self.processes if process.alive]
+            if len(live) < len(self.processes):
+                live += await self._restart_dead()
+            if not live:
+                raise StdioRPCError(f"No live process for {' '.join(self.command)}")
+            return min(live, key=lambda process: process.load)
+
+    async def _restart_dead(self) -> List[StdioProcess]:
+        """Start processes that never ran or crashed, at most once per ``restart_backoff`` each."""
+        started = []
+        now = time.monotonic()
+        for index, process in enumerate(self.processes):
+            if process.alive or now - self._restarted_at.get(index, float("-inf")) < self.restart_backoff:
+                continue
+            self._restarted_at[index] = now
+            replacement = StdioProcess(self.command)
+            try:
+                await replacement.start()
+            except OSError as e:
+                logger.warning("Failed to start stdio MCP server %s: %s", self.command, e)
+                continue
+            await process.close()
+            self.processes[index] = replacement
+            started.append(replacement)
+        return started
+
+    async def close(self):
+        await asyncio.gather(*(process.close() for process in self.processes), return_exceptions=True)
+
+
+class StdioClientPool:
+    """
+    Process pools for ``stdio://package.module`` endpoints, started once on first
+    use. The module is run as ``python -m package.module --stdio`` and must start
+    with one of the configured ``allowed_modules`` prefixes.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.pool_size = self.config.get("pool_size", 2)
+        self.request_timeout = self.config.get("request_timeout", 20)
+        self.restart_backoff = self.config.get("restart_backoff", 1)
+        self.allowed_modules = tuple(self.config.get("allowed_modules") or ("mcp_servers.",))
+        self._pools: Dict[str, StdioProcessPool] = {}
+
+    @staticmethod
+    def is_stdio(url: str) -> bool:
+        return urlsplit(url).scheme == STDIO_SCHEME
+
+    def _pool_for(self, endpoint: str) -> StdioProcessPool:
+        module_name = urlsplit(endpoint).netloc
+        pool = self._pools.get(module_name)
+        if pool is None:
+            if not module_name.startswith(self.allowed_modules):
+                raise StdioRPCError(f"Module '{module_name}' is not allowed as a stdio MCP server")
+            command = [sys.executable, "-m", module_name, "--stdio"]
+            pool = self._pools[module_name] = StdioProcessPool(command, self.pool_size, self.restart_backoff)
+        return pool
+
+    async def request(self, endpoint: str, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        process = await self._pool_for(endpoint).acquire()
+        return await process.request(method, params, self.request_timeout)
+
+    async def aclose(self):
+        """Stop every subprocess. Called on application shutdown."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        await asyncio.gather(*(pool.close() for pool in pools), return_exceptions=True)
+
+
+stdio_client_pool = StdioClientPool(settings.mcp_stdio)
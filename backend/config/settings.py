@@ -7,5 +7,18 @@ class Settings:
         with config_path.open() as f:
             cfg = yaml.safe_load(f)
         self.database_url = cfg["database"]["url"]
+        self.orchestrator = cfg.get("orchestrator") or {}
+        self.http_client = cfg.get("http_client") or {}
+        self.manifest_cache = cfg.get("manifest_cache") or {}
+        self.plan_cache = cfg.get("plan_cache") or {}
+        self.mcp_result_cache = cfg.get("mcp_result_cache") or {}
+        self.planner = cfg.get("planner") or {}
+        self.mcp_batching = cfg.get("mcp_batching") or {}
+        self.mcp_stdio = cfg.get("mcp_stdio") or {}
+        self.mcp_replicas = cfg.get("mcp_replicas") or {}
+        self.chat_history = cfg.get("chat_history") or {}
+        self.retention = cfg.get("retention") or {}
+        self.bulk = cfg.get("bulk") or {}
+        self.sqlite_pragmas = cfg["database"].get("pragmas") or {}
 
 settings = Settings()
@@ -0,0 +1,163 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, Tuple
+
+from backend.database.connection import session_scope
+from backend.database.repository import llm_api_repo, mcp_server_repo, prompt_context_repo
+from backend.core.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LLMApiConfig:
+    id: str
+    name: str
+    base_url: str
+    api_key: Optional[str]
+    config: Optional[str]
+
+
+@dataclass(frozen=True)
+class MCPServerConfig:
+    id: str
+    name: str
+    keywords: Optional[str]
+    endpoint_url: str
+    replicas: Tuple[str, ...] = ()  # active extra endpoints serving the same server
+
+    @property
+    def endpoints(self) -> Tuple[str, ...]:
+        return (self.endpoint_url,) + tuple(url for url in self.replicas if url != self.endpoint_url)
+
+
+@dataclass(frozen=True)
+class PromptContextConfig:
+    id: str
+    name: str
+    description: Optional[str]
+    llm_api_id: Optional[str]
+    request_instruction: Optional[str]
+    response_instruction: Optional[str]
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of the configuration a request runs against."""
+    version: int
+    llm_apis: Tuple[LLMApiConfig, ...]
+    mcp_servers: Tuple[MCPServerConfig, ...]  # active servers only
+    prompt_contexts: Tuple[PromptContextConfig, ...]
+    system_instruction: Optional[str]
+    instruction_mtime: Optional[float]
+    servers_by_name: Dict[str, MCPServerConfig] = field(default_factory=dict)
+    # Every endpoint of a server, keyed by its primary endpoint_url
+    endpoints_by_url: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+
+class ConfigSnapshotStore:
+    """
+    Versioned in-memory copy of the LLM APIs, active MCP servers and their
+    replicas, prompt contexts and system instruction. It is rebuilt when a config service writes
+    (``invalidate``) and the instruction is re-read when its file mtime changes,
+    which is checked at most every ``instruction_check_interval`` seconds.
+    """
+
+    def __init__(self, instruction_path: str = "config/system_instruction.txt",
+                 instruction_check_interval: float = 2.0):
+        self.instruction_path = instruction_path
+        self.instruction_check_interval = instruction_check_interval
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._version = 0
+        self._last_instruction_check = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh()
+        now = time.monotonic()
+        if now - self._last_instruction_check >= self.instruction_check_interval:
+            self._last_instruction_check = now
+            if self._instruction_mtime() != snapshot.instruction_mtime:
+                snapshot = self._reload_instruction()
+        return snapshot
+
+    def invalidate(self):
+        """Called after a configuration write; the new snapshot is built right away."""
+        self.refresh()
+
+    def refresh(self) -> ConfigSnapshot:
+        with self._lock:
+            with session_scope() as db:
+                llm_apis = tuple(
+                    LLMApiConfig(api.id, api.name, api.base_url, api.api_key, api.config)
+                    for api in llm_api_repo.get_all_llm_apis(db)
+                )
+                replicas: Dict[str, list] = {}
+                for replica in mcp_server_repo.get_all_replicas(db):
+                    if replica.is_active is not False:
+                        replicas.setdefault(replica.server_id, []).append(replica.endpoint_url)
+                mcp_servers = tuple(
+                    MCPServerConfig(server.id, server.name, server.keywords, server.endpoint_url,
+                                    tuple(replicas.get(server.id, ())))
+                    for server in mcp_server_repo.get_all_mcp_servers(db)
+                    if server.is_active is not False
+                )
+                prompt_contexts = tuple(
+                    PromptContextConfig(ctx.id, ctx.name, ctx.description, ctx.llm_api_id,
+                                        ctx.request_instruction, ctx.response_instruction)
+                    for ctx in prompt_context_repo.get_all_prompt_contexts(db)
+                )
+            mtime = self._instruction_mtime()
+            self._last_instruction_check = time.monotonic()
+            self._version += 1
+            self._snapshot = ConfigSnapshot(
+                version=self._version,
+                llm_apis=llm_apis,
+                mcp_servers=mcp_servers,
+                prompt_contexts=prompt_contexts,
+                system_instruction=self._read_instruction(),
+                instruction_mtime=mtime,
+                servers_by_name={server.name: server for server in mcp_servers},
+                endpoints_by_url={server.endpoint_url: server.endpoints for server in mcp_servers},
+            )
+            logger.debug("Config snapshot rebuilt (version %d)", self._version)
+            return self._snapshot
+
+    def _reload_instruction(self) -> ConfigSnapshot:
+        with self._lock:
+            self._version += 1
+            self._snapshot = replace(
+                self._snapshot,
+                version=self._version,
+                system_instruction=self._read_instruction(),
+                instruction_mtime=self._instruction_mtime(),
+            )
+            return self._snapshot
+
+    def _instruction_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.instruction_path).st_mtime
+        except OSError:
+            return None
+
+    def _read_instruction(self) -> Optional[str]:
+        try:
+            with open(self.instruction_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError as e:
+            logger.warning(f"Failed to read system instructions: {e}")
+            return None
+
+
+config_snapshot = ConfigSnapshotStore()
+
+registry.gauge(
+    "config_snapshot_version", "Version of the in-memory configuration snapshot", [],
+    lambda: [((), config_snapshot._snapshot.version)] if config_snapshot._snapshot else [],
+)
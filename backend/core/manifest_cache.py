@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from backend.adapter.http_client import http_client_pool
+from backend.adapter.stdio_client import stdio_client_pool
+from backend.config.settings import settings
+from backend.core.server_selector import server_selector
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ManifestEntry:
+    manifest: Dict[str, Any]
+    etag: Optional[str]
+    fetched_at: float
+
+
+class ManifestCache:
+    """
+    Process-wide cache of MCP server manifests.
+
+    Fresh entries (younger than ``ttl``) are served from memory. Stale entries
+    are still served immediately while a background task revalidates them with
+    ``If-None-Match``. A server that fails keeps serving its last-known-good
+    manifest, and is not retried inline for ``failure_backoff`` seconds.
+    """
+
+    def __init__(self, ttl: float = 60, timeout: float = 5, failure_backoff: float = 30):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.failure_backoff = failure_backoff
+        self._entries: Dict[str, ManifestEntry] = {}
+        self._failures: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, base_url: str) -> Dict[str, Any]:
+        """Return the manifest of ``base_url``, fetching it only when needed."""
+        entry = self._entries.get(base_url)
+        if entry and time.monotonic() - entry.fetched_at < self.ttl:
+            return entry.manifest
+        if entry:
+            if not self._recently_failed(base_url):
+                self._refresh(base_url)
+            return entry.manifest
+        if self._recently_failed(base_url):
+            return {}
+        return await asyncio.shield(self._refresh(base_url))
+
+    async def get_many(self, base_urls: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several manifests concurrently, preserving the order of ``base_urls``."""
+        return list(await asyncio.gather(*(self.get(url) for url in base_urls)))
+
+    def peek(self, base_url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached manifest without triggering any network call."""
+        entry = self._entries.get(base_url)
+        return entry.manifest if entry else None
+
+    def invalidate(self, base_url: Optional[str] = None):
+        """Forget one server's manifest, or all of them."""
+        if base_url is None:
+            self._entries.clear()
+            self._failures.clear()
+        else:
+            self._entries.pop(base_url, None)
+            self._failures.pop(base_url, None)
+
+    def _recently_failed(self, base_url: str) -> bool:
+        failed_at = self._failures.get(base_url)
+        return failed_at is not None and time.monotonic() - failed_at < self.failure_backoff
+
+    def _refresh(self, base_url: str) -> asyncio.Task:
+        """Start (or join) the single in-flight fetch for ``base_url``."""
+        task = self._inflight.get(base_url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(base_url))
+            self._inflight[base_url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(base_url, None))
+        return task
+
+    async def _fetch(self, base_url: str) -> Dict[str, Any]:
+        entry = self._entries.get(base_url)
+        headers = {"If-None-Match": entry.etag} if entry and entry.etag else {}
+        # Replicas serve the same manifest, so it is cached under the primary endpoint
+        replica = server_selector.pick(base_url)
+        try:
+            if stdio_client_pool.is_stdio(replica):
+                # Served over the server's pipes; there is no ETag to revalidate with
+                manifest, etag = await stdio_client_pool.request(replica, "manifest"), None
+            else:
+                client, url = http_client_pool.resolve(f"{replica}/manifest.json")
+                resp = await client.get(url, headers=headers, timeout=self.timeout)
+                if resp.status_code == 304 and entry:
+                    entry.fetched_at = time.monotonic()
+                    self._failures.pop(base_url, None)
+                    return entry.manifest
+                resp.raise_for_status()
+                manifest, etag = resp.json(), resp.headers.get("etag")
+        except Exception as e:
+            logger.warning(f"Manifest fetch failed for {base_url}: {str(e) or type(e).__name__}")
+            self._failures[base_url] = time.monotonic()
+            return entry.manifest if entry else {}
+
+        self._entries[base_url] = ManifestEntry(manifest, etag, time.monotonic())
+        self._failures.pop(base_url, None)
+        return manifest
+
+
+manifest_cache = ManifestCache(
+    ttl=settings.manifest_cache.get("ttl", 60),
+    timeout=settings.manifest_cache.get("timeout", 5),
+    failure_backoff=settings.manifest_cache.get("failure_backoff", 30),
+)
@@ -0,0 +1,182 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = "") -> str:
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    parts = [f'{name}="{escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            # Per series: one cumulative count per bucket, then sum and total count
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.label_names, key, 'le="%g"' % bound)
+                lines.append(f"{self.name}_bucket{labels} {count:g}")
+            labels = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]:g}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {series[-1]:g}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for key, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value:g}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str],
+                 collect: Callable[[], Iterable[Tuple[Sequence[str], float]]]):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.TYPE}"]
+        for label_values, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value:g}")
+        return lines
+
+
+class CallbackCounter(Gauge):
+    """Counter whose totals are kept by the instrumented object and read at scrape time."""
+
+    TYPE = "counter"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def histogram(self, name: str, description: str, label_names: Sequence[str] = ()) -> Histogram:
+        metric = Histogram(name, description, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, description, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, description: str, label_names: Sequence[str],
+              collect: Callable[[], Iterable[Tuple[Sequence[str], float]]]) -> Gauge:
+        metric = Gauge(name, description, label_names, collect)
+        self._metrics.append(metric)
+        return metric
+
+    def callback_counter(self, name: str, description: str, label_names: Sequence[str],
+                         collect: Callable[[], Iterable[Tuple[Sequence[str], float]]]) -> CallbackCounter:
+        metric = CallbackCounter(name, description, label_names, collect)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_LATENCY = registry.histogram(
+    "orchestrator_stage_duration_seconds", "Duration of each orchestration stage", ["stage"])
+MCP_LATENCY = registry.histogram(
+    "mcp_request_duration_seconds", "Duration of MCP task calls per server and action", ["server", "action"])
+LLM_LATENCY = registry.histogram(
+    "llm_request_duration_seconds", "Duration of LLM calls per operation", ["operation"])
+PLANS_TOTAL = registry.counter(
+    "orchestrator_plans_total", "Execution plans by the tier that produced them", ["source"])
+
+
+class RequestTimings:
+    """Collects per-stage durations (in milliseconds) for one orchestration run."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage: str, seconds: float):
+        self.stages[stage] = round(seconds * 1000, 2)
+        STAGE_LATENCY.observe(seconds, stage=stage)
+
+    def finish(self) -> Dict[str, float]:
+        self.record("total", time.perf_counter() - self._started)
+        return dict(self.stages)
+
+
+@contextmanager
+def observe(histogram: Histogram, sink: Optional[Dict[str, float]] = None, key: str = "", **labels: str):
+    """Time a block into ``histogram`` and, optionally, into ``sink[key]`` in milliseconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed, **labels)
+        if sink is not None:
+            sink[key] = round(elapsed * 1000, 2)
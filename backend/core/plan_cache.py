@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.config.settings import settings
+from backend.core.lru_cache import LRUCache
+from backend.core.metrics import registry
+from backend.database.repository import async_plan_cache_repo, plan_cache_repo
+
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """
+    Two-level cache of LLM-generated execution plans: an in-memory LRU in front
+    of the ``plan_cache`` SQLite table.
+
+    Keys combine the normalized prompt with hashes of the MCP server manifests
+    and of the system instruction, so editing either one makes old entries
+    unreachable without any explicit invalidation.
+    """
+
+    def __init__(self, enabled: bool = True, max_entries: int = 1024):
+        self.enabled = enabled
+        self._memory = LRUCache(max_entries)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Lower-case, collapse whitespace and drop trailing punctuation."""
+        return re.sub(r"\s+", " ", prompt).strip().lower().rstrip(".!?")
+
+    @staticmethod
+    def hash_manifests(mcp_info: List[Dict[str, Any]]) -> str:
+        servers = sorted(mcp_info, key=lambda server: server.get("server_name") or "")
+        return _sha256(json.dumps(servers, sort_keys=True, default=str))
+
+    @staticmethod
+    def hash_instruction(system_instruction: str) -> str:
+        return _sha256(system_instruction)
+
+    def make_key(self, prompt: str, mcp_info: List[Dict[str, Any]], system_instruction: str) -> Dict[str, str]:
+        """Return the cache key together with the parts it was derived from."""
+        parts = {
+            "normalized_prompt": self.normalize_prompt(prompt),
+            "manifests_hash": self.hash_manifests(mcp_info),
+            "instruction_hash": self.hash_instruction(system_instruction),
+        }
+        parts["cache_key"] = _sha256("\x1f".join(
+            [parts["normalized_prompt"], parts["manifests_hash"], parts["instruction_hash"]]
+        ))
+        return parts
+
+    async def get(self, db: AsyncSession, cache_key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        plan = self._memory.get(cache_key)
+        if plan is not None:
+            self.memory_hits += 1
+            return plan
+        try:
+            entry = await async_plan_cache_repo.get_plan_cache_entry(db, cache_key)
+        except Exception as e:
+            logger.warning(f"Plan cache lookup failed: {str(e)}")
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._memory.set(cache_key, entry.plan)
+        return entry.plan
+
+    async def put(self, db: AsyncSession, key_parts: Dict[str, str], plan: str):
+        if not self.enabled:
+            return
+        self._memory.set(key_parts["cache_key"], plan)
+        try:
+            await async_plan_cache_repo.save_plan_cache_entry(db, {**key_parts, "plan": plan})
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Plan cache write failed: {str(e)}")
+
+    def purge(self, db: Session) -> int:
+        """Drop every cached plan from memory and disk. Returns the number of disk rows removed."""
+        self._memory.clear()
+        return plan_cache_repo.delete_all_plan_cache_entries(db)
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "disk_entries": plan_cache_repo.count_plan_cache_entries(db),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+plan_cache = PlanCache(
+    enabled=settings.plan_cache.get("enabled", True),
+    max_entries=settings.plan_cache.get("max_entries", 1024),
+)
+
+
+registry.callback_counter(
+    "plan_cache_lookups_total", "Plan cache lookups by outcome", ["outcome"],
+    lambda: [(("memory_hit",), plan_cache.memory_hits), (("disk_hit",), plan_cache.disk_hits),
+             (("miss",), plan_cache.misses)],
+)
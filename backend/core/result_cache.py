@@ -0,0 +1,47 @@
+import json
+from typing import Any, Dict, Optional
+
+from backend.config.settings import settings
+from backend.core.lru_cache import LRUCache
+from backend.core.metrics import registry
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize a payload so equivalent requests (e.g. 5 vs 5.0) share a key."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def make_result_key(endpoint: str, action: str, payload: Dict[str, Any]) -> str:
+    canonical_payload = json.dumps(_canonical(payload), sort_keys=True, separators=(",", ":"))
+    return f"{endpoint}\x1f{action}\x1f{canonical_payload}"
+
+
+def find_action(manifest: Optional[Dict[str, Any]], action: str) -> Optional[Dict[str, Any]]:
+    """Return the manifest entry describing ``action``, if any."""
+    for entry in (manifest or {}).get("actions") or []:
+        if entry.get("name") == action:
+            return entry
+    return None
+
+
+def is_cacheable(action_entry: Optional[Dict[str, Any]]) -> bool:
+    """Servers opt in by flagging an action ``deterministic`` or ``cacheable`` in their manifest."""
+    return bool(action_entry and (action_entry.get("deterministic") or action_entry.get("cacheable")))
+
+
+mcp_result_cache = LRUCache(
+    max_entries=settings.mcp_result_cache.get("max_entries", 4096),
+    ttl=settings.mcp_result_cache.get("default_ttl", 300),
+)
+
+
+registry.callback_counter(
+    "mcp_result_cache_lookups_total", "MCP result cache lookups by outcome", ["outcome"],
+    lambda: [(("hit",), mcp_result_cache.hits), (("miss",), mcp_result_cache.misses)],
+)
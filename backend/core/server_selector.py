@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from backend.adapter.http_client import http_client_pool
+from backend.adapter.stdio_client import StdioRPCError, stdio_client_pool
+from backend.config.settings import settings
+from backend.core.config_snapshot import config_snapshot
+from backend.core.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("least_outstanding", "ewma")
+
+
+@dataclass
+class ReplicaState:
+    endpoint: str
+    outstanding: int = 0
+    ewma_ms: Optional[float] = None
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    healthy: Optional[bool] = None  # result of the last active check, None until probed
+    last_checked: Optional[float] = None
+    last_error: Optional[str] = None
+    requests: int = 0
+    failures: int = 0
+
+    def available(self, now: float) -> bool:
+        return self.healthy is not False and self.ejected_until <= now
+
+
+def is_replica_failure(error: BaseException) -> bool:
+    """Errors that say something about the replica, as opposed to a bad request it rejected."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    if isinstance(error, StdioRPCError):
+        # The process answered; only an internal error counts against it
+        return error.code is None or error.code == -32603
+    return True
+
+
+class ServerSelector:
+    """
+    Spreads calls to an MCP server across its endpoints (``endpoint_url`` plus
+    rows in ``mcp_server_replicas``). Each call goes to the available replica with
+    the fewest requests in flight (``least_outstanding``) or the lowest
+    ``(outstanding + 1) * EWMA latency`` (``ewma``). A replica is ejected after
+    ``failure_threshold`` consecutive failures, for ``ejection_seconds`` doubling
+    up to ``max_ejection_seconds``, and is taken out of rotation when an active
+    health check fails; a passing check brings it straight back. When no replica
+    is available every endpoint is tried anyway rather than failing the call.
+    """
+
+    def __init__(self, strategy: str = "least_outstanding", ewma_alpha: float = 0.3,
+                 failure_threshold: int = 3, ejection_seconds: float = 10, max_ejection_seconds: float = 300,
+                 health_check_interval: float = 10, health_check_timeout: float = 2,
+                 health_checks_enabled: bool = True):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica selection strategy '{strategy}', use one of {STRATEGIES}")
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self.max_ejection_seconds = max_ejection_seconds
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.health_checks_enabled = health_checks_enabled
+        self._states: Dict[str, ReplicaState] = {}
+
+    def endpoints_for(self, endpoint: str) -> Tuple[str, ...]:
+        """All endpoints of the server whose primary ``endpoint_url`` is ``endpoint``."""
+        return config_snapshot.current().endpoints_by_url.get(endpoint, (endpoint,))
+
+    def state(self, endpoint: str) -> ReplicaState:
+        state = self._states.get(endpoint)
+        if state is None:
+            state = self._states[endpoint] = ReplicaState(endpoint)
+        return state
+
+    def pick(self, endpoint: str, exclude: Iterable[str] = ()) -> str:
+        """Choose the replica for the next call to ``endpoint``."""
+        replicas = [replica for replica in self.endpoints_for(endpoint) if replica not in exclude]
+        if len(replicas) <= 1:
+            return replicas[0] if replicas else endpoint
+        now = time.monotonic()
+        states = [self.state(replica) for replica in replicas]
+        candidates = [state for state in states if state.available(now)] or states
+        random.shuffle(candidates)  # spread ties instead of always hitting the first replica
+        return min(candidates, key=self._score).endpoint
+
+    def _score(self, state: ReplicaState) -> Tuple[float, float]:
+        latency = state.ewma_ms or 0.0
+        if self.strategy == "ewma":
+            return (state.outstanding + 1) * latency, state.outstanding
+        return state.outstanding, latency
+
+    async def call(self, endpoint: str, send: Callable[[str], Awaitable[Any]]) -> Any:
+        """
+        Run ``send(replica)`` on a replica of ``endpoint``, recording its outcome.
+        Connection failures are retried on the next replica, since the request
+        never reached the server.
+        """
+        tried: List[str] = []
+        while True:
+            replica = self.pick(endpoint, exclude=tried)
+            tried.append(replica)
+            state = self.state(replica)
+            state.outstanding += 1
+            state.requests += 1
+            started = time.perf_counter()
+            try:
+                result = await send(replica)
+            except Exception as e:
+                if is_replica_failure(e):
+                    self.record_failure(replica, e)
+                if isinstance(e, httpx.ConnectError) and len(tried) < len(self.endpoints_for(endpoint)):
+                    logger.info("Replica %s of %s unreachable, retrying on another", replica, endpoint)
+                    continue
+                raise
+            else:
+                self.record_success(replica, (time.perf_counter() - started) * 1000)
+                return result
+            finally:
+                state.outstanding -= 1
+
+    def record_success(self, replica: str, elapsed_ms: float):
+        state = self.state(replica)
+        state.ewma_ms = elapsed_ms if state.ewma_ms is None else (
+            self.ewma_alpha * elapsed_ms + (1 - self.ewma_alpha) * state.ewma_ms
+        )
+        state.consecutive_failures = 0
+        state.ejections = 0
+
+    def record_failure(self, replica: str, error: BaseException):
+        state = self.state(replica)
+        state.failures += 1
+        state.consecutive_failures += 1
+        state.last_error = str(error) or type(error).__name__
+        # Stays at or above the threshold, so a replica failing right after its ejection ends goes straight back out
+        if state.consecutive_failures >= self.failure_threshold and state.ejected_until <= time.monotonic():
+            state.ejections += 1
+            duration = min(self.ejection_seconds * 2 ** (state.ejections - 1), self.max_ejection_seconds)
+            state.ejected_until = time.monotonic() + duration
+            logger.warning("Ejected MCP replica %s for %.0fs after %d consecutive failures: %s",
+                           replica, duration, state.consecutive_failures, state.last_error)
+
+    async def check_once(self):
+        """Probe every configured endpoint's manifest and update its health."""
+        endpoints = {replica for server in config_snapshot.current().mcp_servers for replica in server.endpoints}
+        for stale in set(self._states) - endpoints:
+            if self._states[stale].outstanding == 0:
+                del self._states[stale]
+        await asyncio.gather(*(self._probe(endpoint) for endpoint in endpoints))
+
+    async def _probe(self, endpoint: str):
+        state = self.state(endpoint)
+        try:
+            if stdio_client_pool.is_stdio(endpoint):
+                await asyncio.wait_for(stdio_client_pool.request(endpoint, "manifest"), self.health_check_timeout)
+            else:
+                client, url = http_client_pool.resolve(f"{endpoint}/manifest.json")
+                resp = await client.get(url, timeout=self.health_check_timeout)
+                resp.raise_for_status()
+        except Exception as e:
+            if state.healthy is not False:
+                logger.warning("MCP replica %s failed its health check: %s", endpoint, str(e) or type(e).__name__)
+            state.healthy = False
+            state.last_error = str(e) or type(e).__name__
+        else:
+            if state.healthy is False or state.ejected_until > time.monotonic():
+                logger.info("MCP replica %s passed its health check and is back in rotation", endpoint)
+            state.healthy = True
+            state.ejected_until = 0.0
+            state.consecutive_failures = 0
+        state.last_checked = time.time()
+
+    async def run_periodically(self):
+        """Background loop started by the application lifespan."""
+        while True:
+            try:
+                await self.check_once()
+            except Exception:
+                logger.exception("MCP replica health check failed")
+            await asyncio.sleep(self.health_check_interval)
+
+    def status(self, endpoint: str) -> List[Dict[str, Any]]:
+        """Health of each replica of the server whose primary endpoint is ``endpoint``."""
+        now = time.monotonic()
+        report = []
+        for replica in self.endpoints_for(endpoint):
+            state = self._states.get(replica) or ReplicaState(replica)
+            if state.ejected_until > now:
+                status = "ejected"
+            elif state.healthy is None:
+                status = "unknown"
+            else:
+                status = "healthy" if state.healthy else "unhealthy"
+            report.append({
+                "endpoint_url": replica,
+                "status": status,
+                "outstanding": state.outstanding,
+                "ewma_ms": round(state.ewma_ms, 2) if state.ewma_ms is not None else None,
+                "requests": state.requests,
+                "failures": state.failures,
+                "consecutive_failures": state.consecutive_failures,
+                "ejected_for_seconds": round(state.ejected_until - now, 1) if state.ejected_until > now else 0,
+                "last_checked": state.last_checked,
+                "last_error": state.last_error,
+            })
+        return report
+
+
+server_selector = ServerSelector(
+    strategy=settings.mcp_replicas.get("strategy", "least_outstanding"),
+    ewma_alpha=settings.mcp_replicas.get("ewma_alpha", 0.3),
+    failure_threshold=settings.mcp_replicas.get("failure_threshold", 3),
+    ejection_seconds=settings.mcp_replicas.get("ejection_seconds", 10),
+    max_ejection_seconds=settings.mcp_replicas.get("max_ejection_seconds", 300),
+    health_check_interval=settings.mcp_replicas.get("health_check_interval", 10),
+    health_check_timeout=settings.mcp_replicas.get("health_check_timeout", 2),
+    health_checks_enabled=settings.mcp_replicas.get("health_checks", True),
+)
+
+registry.gauge(
+    "mcp_replica_outstanding_requests", "Requests in flight per MCP server endpoint", ["endpoint"],
+    lambda: [((state.endpoint,), state.outstanding) for state in list(server_selector._states.values())],
+)
+registry.gauge(
+    "mcp_replica_available", "1 when an MCP server endpoint is in rotation, 0 when ejected or unhealthy", ["endpoint"],
+    lambda: [((state.endpoint,), int(state.available(time.monotonic())))
+             for state in list(server_selector._states.values())],
+)
@@ -0,0 +1,116 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.config.settings import settings
+
+
+ARCHIVE_DIR = Path(settings.retention.get("archive_dir", "./archive"))
+
+# Same columns (and column order) as chat_history in schema.sql, so rows are copied verbatim
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {schema}.chat_history (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    session_title TEXT,
+    user_id TEXT,
+    context_category_id TEXT,
+    original_prompt TEXT,
+    refined_prompt TEXT,
+    final_response TEXT,
+    steps TEXT,
+    requests TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS {schema}.idx_chat_history_session_created
+    ON chat_history(session_id, created_at);
+
+-- Same full-text index as the hot table, so archived conversations stay searchable
+CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.chat_history_fts USING fts5(
+    original_prompt,
+    final_response,
+    session_title,
+    content='chat_history',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS {schema}.chat_history_fts_insert AFTER INSERT ON chat_history BEGIN
+    INSERT INTO chat_history_fts(rowid, original_prompt, final_response, session_title)
+    VALUES (new.rowid, new.original_prompt, new.final_response, new.session_title);
+END;
+CREATE TRIGGER IF NOT EXISTS {schema}.chat_history_fts_delete AFTER DELETE ON chat_history BEGIN
+    INSERT INTO chat_history_fts(chat_history_fts, rowid, original_prompt, final_response, session_title)
+    VALUES ('delete', old.rowid, old.original_prompt, old.final_response, old.session_title);
+END;
+"""
+
+CHAT_HISTORY_COLUMNS = (
+    "id, session_id, session_title, user_id, context_category_id, original_prompt, "
+    "refined_prompt, final_response, steps, requests, created_at"
+)
+
+_engines: Dict[str, Engine] = {}
+_lock = threading.Lock()
+
+
+def archive_file_for(last_activity: str) -> str:
+    """Archive files are partitioned by the month of a session's last activity."""
+    return f"chat_history_{last_activity[:7].replace('-', '_')}.db"
+
+
+def archive_path(archive_file: str) -> Path:
+    return ARCHIVE_DIR / archive_file
+
+
+def prepare_archive(conn, schema: str = "main"):
+    """Create the archive tables in ``schema``, indexing rows of archives made before the full-text index."""
+    fts_existed = conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'chat_history_fts'"
+    ).fetchone() is not None
+    conn.executescript(ARCHIVE_SCHEMA.format(schema=schema))
+    if not fts_existed:
+        conn.execute(f"INSERT INTO {schema}.chat_history_fts(chat_history_fts) VALUES ('rebuild')")
+        conn.commit()
+
+
+def _engine_for(archive_file: str) -> Engine:
+    with _lock:
+        engine = _engines.get(archive_file)
+        if engine is None:
+            engine = create_engine(
+                f"sqlite:///{archive_path(archive_file)}",
+                connect_args={"check_same_thread": False},
+                pool_size=1, max_overflow=4,
+            )
+            conn = engine.raw_connection()
+            try:
+                prepare_archive(conn)
+            finally:
+                conn.close()
+            _engines[archive_file] = engine
+        return engine
+
+
+@contextmanager
+def archive_session(archive_file: str) -> Iterator[Session]:
+    """
+    Session on one archive file. The ORM models and ``chat_history_repo`` work
+    on it unchanged, since the archive holds the same ``chat_history`` table.
+    """
+    db = sessionmaker(autocommit=False, autoflush=False, bind=_engine_for(archive_file))()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def dispose_archive_engines():
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
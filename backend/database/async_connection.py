@@ -0,0 +1,39 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from backend.core.config_loader import load_config
+from backend.database.connection import monitored_engines, pool_options
+
+
+config = load_config("dev")
+DATABASE_URL = config["database"]["url"]
+# Same database as the sync engine, reached through the aiosqlite driver unless configured otherwise
+ASYNC_DATABASE_URL = config["database"].get("async_url") or DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(config["database"]))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """Unit of work: one async session, rolled back on error and always closed."""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency providing a request-scoped async session. Streaming
+    endpoints should open ``async_session_scope`` inside their generator instead,
+    so the session lives exactly as long as the stream.
+    """
+    async with async_session_scope() as db:
+        yield db
+
+
+monitored_engines["async"] = async_engine.sync_engine
@@ -1,12 +1,66 @@
+from contextlib import contextmanager
+from typing import Iterator
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from backend.core.config_loader import load_config
+from backend.core.metrics import registry
 
 
 config = load_config("dev")
 DATABASE_URL = config["database"]["url"]
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+def pool_options(database_config: dict) -> dict:
+    """Connection pool sizing shared by the sync and async engines."""
+    return {
+        "pool_size": database_config.get("pool_size", 5),
+        "max_overflow": database_config.get("max_overflow", 10),
+        "pool_timeout": database_config.get("pool_timeout", 30),
+        "pool_recycle": database_config.get("pool_recycle", 1800),
+        "pool_pre_ping": True,
+    }
+
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, **pool_options(config["database"]))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Unit of work: one session, rolled back on error and always closed."""
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_db() -> Iterator[Session]:
+    """FastAPI dependency providing a request-scoped session."""
+    with session_scope() as db:
+        yield db
+
+
+# Engines reported by the ``db_pool_connections`` gauge, keyed by label; read at
+# scrape time because ``dispose()`` swaps in a fresh pool
+monitored_engines = {"sync": engine}
+
+
+def _pool_samples():
+    for engine_name, monitored in monitored_engines.items():
+        pool = monitored.pool
+        if not hasattr(pool, "checkedout"):
+            continue
+        # QueuePool counts overflow from -pool_size; only connections beyond the pool are reported
+        yield (engine_name, "size"), pool.size()
+        yield (engine_name, "checked_out"), pool.checkedout()
+        yield (engine_name, "idle"), pool.checkedin()
+        yield (engine_name, "overflow"), max(pool.overflow(), 0)
+
+
+registry.gauge("db_pool_connections", "Database connection pool usage", ["engine", "state"], _pool_samples)
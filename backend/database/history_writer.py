@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend.config.settings import settings
+from backend.database.async_connection import async_session_scope
+from backend.database.repository import async_chat_history_repo
+
+
+logger = logging.getLogger(__name__)
+
+
+class ChatHistoryWriter:
+    """
+    Write-behind queue for chat history. Rows are queued off the response path and
+    inserted by a background task, many per transaction; ``close`` flushes what is left.
+    A failed batch is retried ``max_retries`` times with doubling backoff, then written
+    row by row so a bad row only loses itself.
+    """
+
+    def __init__(self, enabled: bool = True, max_batch_size: int = 100, flush_interval_ms: float = 50,
+                 max_retries: int = 3, retry_backoff_ms: float = 100):
+        self.enabled = enabled
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Titles of sessions whose rows are still queued, so later messages reuse them
+        self._pending_titles: Dict[str, str] = {}
+        self._pending_counts: Dict[str, int] = {}
+
+    async def save(self, data: dict):
+        """Persist one message, queued when write-behind is enabled and inline otherwise."""
+        if not self.enabled:
+            async with async_session_scope() as db:
+                await async_chat_history_repo.create_chat_history(db, data)
+            return
+        # Identity and timestamp are fixed now, so queued rows keep their order and time
+        row = {"id": str(uuid.uuid4()), "created_at": datetime.now().isoformat(), **data}
+        session_id = row["session_id"]
+        self._pending_titles.setdefault(session_id, row.get("session_title"))
+        self._pending_counts[session_id] = self._pending_counts.get(session_id, 0) + 1
+        self._ensure_worker()
+        self._queue.put_nowait(row)
+
+    def pending_title(self, session_id: str) -> Optional[str]:
+        return self._pending_titles.get(session_id)
+
+    async def close(self):
+        """Write every queued row and stop the background task."""
+        if self._worker is None:
+            return
+        joined = asyncio.ensure_future(self._queue.join())
+        await asyncio.wait([joined, self._worker], return_when=asyncio.FIRST_COMPLETED)
+        joined.cancel()
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        # Rows the worker did not get to (it stopped unexpectedly) are written here
+        remaining = []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        for start in range(0, len(remaining), self.max_batch_size):
+            await self._write(remaining[start:start + self.max_batch_size])
+        self._worker = None
+        self._queue = None
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Give concurrent requests a moment to join the same transaction
+            await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[dict]):
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with async_session_scope() as db:
+                        await async_chat_history_repo.create_chat_histories(db, batch)
+                    return
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        logger.warning("Failed to write %d chat history rows, writing them one by one: %s",
+                                       len(batch), e)
+                    else:
+                        # Transient errors such as "database is locked" usually clear quickly
+                        await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+            for row in batch:
+                try:
+                    async with async_session_scope() as db:
+                        await async_chat_history_repo.create_chat_histories(db, [row])
+                except Exception:
+                    logger.exception("Dropping chat history row %s of session %s", row["id"], row["session_id"])
+        finally:
+            self._release(batch)
+
+    def _release(self, batch: List[dict]):
+        for row in batch:
+            session_id = row["session_id"]
+            self._pending_counts[session_id] -= 1
+            if not self._pending_counts[session_id]:
+                del self._pending_counts[session_id]
+                self._pending_titles.pop(session_id, None)
+
+
+chat_history_writer = ChatHistoryWriter(
+    enabled=settings.chat_history.get("write_behind", True),
+    max_batch_size=settings.chat_history.get("max_batch_size", 100),
+    flush_interval_ms=settings.chat_history.get("flush_interval_ms", 50),
+    max_retries=settings.chat_history.get("max_retries", 3),
+    retry_backoff_ms=settings.chat_history.get("retry_backoff_ms", 100),
+)
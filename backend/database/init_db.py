@@ -1,27 +1,62 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import logging
+import time
 from backend.config.settings import settings
 from pathlib import Path
 
 from backend.database.models import *
+# The engine, session factory and request dependency live in connection.py
+from backend.database.connection import engine, SessionLocal, get_db, session_scope
+from backend.database.async_connection import async_engine
+from sqlalchemy import event
 
 
-# --- SQLAlchemy Engine & Session ---
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+logger = logging.getLogger(__name__)
 
-Base = declarative_base()
 
-# --- Dependency for FastAPI routes ---
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# --- SQLite Pragmas (applied to every new connection of both engines) ---
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    for name, value in settings.sqlite_pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+if settings.database_url.startswith("sqlite"):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+
+# --- Incremental vacuum (used by the retention job) ---
+def enable_incremental_vacuum(conn, migrate: bool = False) -> bool:
+    """
+    Switch the database to incremental auto-vacuum. A new database only needs the
+    pragma. An existing one needs a full, blocking VACUUM, which may renumber rowids,
+    so it is only converted when ``migrate`` is set (see ``--incremental-vacuum``
+    below); the caller must then rebuild the full-text index. Returns True when a
+    VACUUM ran.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return False
+    has_tables = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table'").fetchone() is not None
+    if not has_tables:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        return False
+    if not migrate:
+        logger.warning(
+            "auto_vacuum is not INCREMENTAL, so the retention job cannot return freed pages. "
+            "Run 'python -m backend.database.init_db --incremental-vacuum' once to convert the database."
+        )
+        return False
+    logger.warning("Converting the database to incremental auto-vacuum; running a full VACUUM")
+    started = time.perf_counter()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    logger.warning("VACUUM finished in %.1fs", time.perf_counter() - started)
+    return True
+
 
 # --- Schema Initialization (Optional from schema.sql) ---
-def init_db_from_schema():
+def init_db_from_schema(migrate_incremental_vacuum: bool = False):
     schema_path = Path("config/schema.sql")
     if not schema_path.exists():
         print("⚠️  Schema file not found at config/schema.sql")
@@ -30,9 +65,35 @@ def init_db_from_schema():
     import sqlite3
     db_path = settings.database_url.replace("sqlite:///", "")
     conn = sqlite3.connect(db_path)
+    apply_sqlite_pragmas(conn)
+    fts_existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_history_fts'"
+    ).fetchone() is not None
+    sessions_existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_sessions'"
+    ).fetchone() is not None
+    vacuumed = enable_incremental_vacuum(conn, migrate_incremental_vacuum)
     with schema_path.open("r") as f:
         conn.executescript(f.read())
+    if not fts_existed or vacuumed:
+        # Index rows written before the full-text table existed, or renumbered by VACUUM
+        conn.execute("INSERT INTO chat_history_fts(chat_history_fts) VALUES ('rebuild')")
+    if not sessions_existed:
+        # Summarize sessions written before the table and its triggers existed
+        conn.execute(
+            "INSERT OR REPLACE INTO chat_sessions(session_id, session_title, last_activity) "
+            "SELECT session_id, max(session_title), max(created_at) FROM chat_history GROUP BY session_id"
+        )
     conn.commit()
     conn.close()
     print("✅ Database initialized from schema.sql")
 
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Initialize or migrate the database from config/schema.sql")
+    parser.add_argument("--incremental-vacuum", action="store_true",
+                        help="convert an existing database to incremental auto-vacuum (runs a full VACUUM)")
+    init_db_from_schema(migrate_incremental_vacuum=parser.parse_args().incremental_vacuum)
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Text, Boolean, ForeignKey, JSON
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, Text, Boolean, ForeignKey, Integer
+from sqlalchemy.orm import declarative_base, deferred
 from datetime import datetime
 
+from backend.database.types import CompressedJSON, CompressedText
+
 Base = declarative_base()
 
 class User(Base):
@@ -44,6 +46,15 @@ class MCPServer(Base):
     is_active = Column(Boolean, default=True)
 
 
+class MCPServerReplica(Base):
+    __tablename__ = "mcp_server_replicas"
+
+    id = Column(Text, primary_key=True)
+    server_id = Column(Text, ForeignKey("mcp_servers.id"), nullable=False)
+    endpoint_url = Column(Text, nullable=False)
+    is_active = Column(Boolean, default=True)
+
+
 class ChatHistory(Base):
     __tablename__ = "chat_history"
 
@@ -53,8 +64,40 @@ class ChatHistory(Base):
     user_id = Column(Text, ForeignKey("users.id"))
     context_category_id = Column(Text, ForeignKey("prompt_context.id"))
     original_prompt = Column(Text)
-    refined_prompt = Column(Text)
+    # Verbose columns are compressed and only loaded when asked for (see ``undefer``)
+    refined_prompt = deferred(Column(CompressedText))
     final_response = Column(Text)
-    steps = Column(JSON)  # list of steps executed
-    requests = Column(JSON)  # requests sent to MCPs
+    steps = deferred(Column(CompressedJSON))  # list of steps executed
+    requests = deferred(Column(CompressedJSON))  # requests sent to MCPs
     created_at = Column(Text, default=lambda: datetime.now().isoformat())
+
+
+class PlanCacheEntry(Base):
+    __tablename__ = "plan_cache"
+
+    cache_key = Column(Text, primary_key=True)
+    normalized_prompt = Column(Text, nullable=False)
+    manifests_hash = Column(Text, nullable=False)
+    instruction_hash = Column(Text, nullable=False)
+    plan = Column(Text, nullable=False)
+    created_at = Column(Text, default=lambda: datetime.now().isoformat())
+
+
+class ChatSession(Base):
+    """Per-session summary of ``chat_history``, maintained by triggers in schema.sql."""
+    __tablename__ = "chat_sessions"
+
+    session_id = Column(Text, primary_key=True)
+    session_title = Column(Text)
+    last_activity = Column(Text, nullable=False)
+
+
+class ArchivedSession(Base):
+    __tablename__ = "archive_index"
+
+    session_id = Column(Text, primary_key=True)
+    archive_file = Column(Text, nullable=False)
+    session_title = Column(Text)
+    last_activity = Column(Text, nullable=False)
+    message_count = Column(Integer, nullable=False)
+    archived_at = Column(Text, nullable=False)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from backend.database import models
+
+
+def get_archived_session(db: Session, session_id: str):
+    return db.query(models.ArchivedSession).filter(models.ArchivedSession.session_id == session_id).first()
+
+def count_archived_sessions(db: Session) -> int:
+    return db.query(models.ArchivedSession).count()
+
+def list_archive_files(db: Session):
+    return [row.archive_file for row in db.query(models.ArchivedSession.archive_file).distinct()]
+
+def list_archived_sessions(db: Session, limit: int = 50, before: Optional[tuple] = None):
+    """
+    Archived sessions ordered by latest activity, newest first, with the same
+    ``(last_activity, session_id)`` keyset as ``chat_history_repo.list_sessions``.
+    Sessions that also have messages in the hot table are listed from there instead.
+    """
+    archived = models.ArchivedSession
+    hot_sessions = db.query(models.ChatSession.session_id)
+    query = db.query(archived).filter(~archived.session_id.in_(hot_sessions))
+    if before:
+        query = query.filter(tuple_(archived.last_activity, archived.session_id) < tuple_(*before))
+    return query.order_by(archived.last_activity.desc(), archived.session_id.desc()).limit(limit).all()
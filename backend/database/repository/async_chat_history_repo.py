@@ -0,0 +1,38 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import ChatHistory
+import uuid
+
+
+async def create_chat_history(db: AsyncSession, data: dict):
+    record = ChatHistory(id=str(uuid.uuid4()), **data)
+    db.add(record)
+    await db.commit()
+    return record
+
+async def create_chat_histories(db: AsyncSession, rows: List[dict]):
+    """Insert several messages in a single transaction."""
+    db.add_all([ChatHistory(**{"id": str(uuid.uuid4()), **data}) for data in rows])
+    await db.commit()
+
+async def get_chat_history(db: AsyncSession, history_id: str):
+    return await db.get(ChatHistory, history_id)
+
+async def get_chat_history_by_session(db: AsyncSession, session_id: str):
+    result = await db.execute(
+        select(ChatHistory).filter(ChatHistory.session_id == session_id).order_by(ChatHistory.created_at)
+    )
+    return result.scalars().all()
+
+async def get_session_title(db: AsyncSession, session_id: str) -> Tuple[bool, Optional[str]]:
+    """Return whether the session has any message, and the title of its first message."""
+    result = await db.execute(
+        select(ChatHistory.session_title)
+        .filter(ChatHistory.session_id == session_id)
+        .order_by(ChatHistory.created_at)
+        .limit(1)
+    )
+    row = result.first()
+    return (row is not None, row.session_title if row else None)
@@ -0,0 +1,10 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database import models
+
+
+async def get_plan_cache_entry(db: AsyncSession, cache_key: str):
+    return await db.get(models.PlanCacheEntry, cache_key)
+
+async def save_plan_cache_entry(db: AsyncSession, data: dict):
+    obj = await db.merge(models.PlanCacheEntry(**data))
+    await db.commit(); return obj
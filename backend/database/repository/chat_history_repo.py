@@ -1,7 +1,15 @@
-from sqlalchemy.orm import Session
-from backend.database.models import ChatHistory
+from typing import Optional
+
+from sqlalchemy import and_, or_, text, tuple_
+from sqlalchemy.orm import Session, undefer
+from backend.database.models import ChatHistory, ChatSession
 import uuid
 
+
+def _with_steps(query, include_steps: bool):
+    """Load the deferred (compressed) steps column together with the rows."""
+    return query.options(undefer(ChatHistory.steps)) if include_steps else query
+
 def create_chat_history(db: Session, data: dict):
     record = ChatHistory(id=str(uuid.uuid4()), **data)
     db.add(record)
@@ -15,8 +23,17 @@ def get_chat_history(db: Session, session_id: str):
 def get_all_chat_history(db: Session):
     return db.query(ChatHistory).all()
 
-def get_chat_history_by_session(db: Session, session_id: str):
-    return db.query(ChatHistory).filter(ChatHistory.session_id == session_id).order_by(ChatHistory.created_at).all()
+def get_chat_history_by_session(db: Session, session_id: str, include_steps: bool = False):
+    query = db.query(ChatHistory).filter(ChatHistory.session_id == session_id).order_by(ChatHistory.created_at)
+    return _with_steps(query, include_steps).all()
+
+def get_message_steps(db: Session, message_id: str):
+    """The decoded ``steps`` and ``requests`` of one message, or None."""
+    return (
+        db.query(ChatHistory.id, ChatHistory.steps, ChatHistory.requests)
+        .filter(ChatHistory.id == message_id)
+        .first()
+    )
 
 def delete_chat_history(db: Session, session_id: str):
     record = get_chat_history(db, session_id)
@@ -26,3 +43,59 @@ def delete_chat_history(db: Session, session_id: str):
         return True
     return False
 
+def list_sessions(db: Session, limit: int = 50, before: Optional[tuple] = None):
+    """
+    Sessions ordered by latest activity, newest first.
+    ``before`` is the ``(last_activity, session_id)`` of the last row of the previous page.
+    """
+    query = db.query(ChatSession)
+    if before:
+        # A row-value comparison lets SQLite seek the (last_activity, session_id) index
+        query = query.filter(tuple_(ChatSession.last_activity, ChatSession.session_id) < tuple_(*before))
+    return query.order_by(ChatSession.last_activity.desc(), ChatSession.session_id.desc()).limit(limit).all()
+
+def get_chat_history_page(db: Session, session_id: str, limit: int, before: Optional[tuple] = None,
+                          include_steps: bool = False):
+    """
+    The ``limit`` messages of a session that precede ``before`` (a ``(created_at, id)``
+    keyset cursor), returned oldest first.
+    """
+    query = db.query(ChatHistory).filter(ChatHistory.session_id == session_id)
+    if before:
+        before_created, before_id = before
+        query = query.filter(or_(
+            ChatHistory.created_at < before_created,
+            and_(ChatHistory.created_at == before_created, ChatHistory.id < before_id)
+        ))
+    query = _with_steps(query, include_steps)
+    rows = query.order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc()).limit(limit).all()
+    return list(reversed(rows))
+
+def iter_chat_history_by_session(db: Session, session_id: str, batch_size: int = 100,
+                                 include_steps: bool = True):
+    """Stream a session's messages oldest first, fetching ``batch_size`` rows at a time."""
+    query = (
+        db.query(ChatHistory)
+        .filter(ChatHistory.session_id == session_id)
+        .order_by(ChatHistory.created_at, ChatHistory.id)
+    )
+    return _with_steps(query, include_steps).yield_per(batch_size)
+
+_SEARCH_SQL = text("""
+    SELECT h.id, h.session_id, h.session_title, h.created_at,
+           snippet(chat_history_fts, 0, '**', '**', '…', 12) AS prompt_snippet,
+           snippet(chat_history_fts, 1, '**', '**', '…', 16) AS answer_snippet,
+           bm25(chat_history_fts, 1.0, 1.0, 2.0) AS score
+    FROM chat_history_fts
+    JOIN chat_history h ON h.rowid = chat_history_fts.rowid
+    WHERE chat_history_fts MATCH :match
+    ORDER BY score
+    LIMIT :limit OFFSET :offset
+""")
+
+def search_chat_history(db: Session, match: str, limit: int = 20, offset: int = 0):
+    """
+    Messages matching an FTS5 ``match`` expression, best bm25 score first
+    (session titles weigh double).
+    """
+    return db.execute(_SEARCH_SQL, {"match": match, "limit": limit, "offset": offset}).all()
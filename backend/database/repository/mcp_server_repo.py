@@ -1,3 +1,5 @@
+from typing import List
+
 from sqlalchemy.orm import Session
 from backend.database import models
 import uuid
@@ -25,6 +27,31 @@ def update_mcp_server(db: Session, mcp_id: str, data: dict):
 
 def delete_mcp_server(db: Session, mcp_id: str):
     obj = get_mcp_server(db, mcp_id)
-    if obj: db.delete(obj); db.commit(); return True
+    if obj:
+        _replicas(db, mcp_id).delete(synchronize_session=False)
+        db.delete(obj); db.commit(); return True
     return False
 
+
+def _replicas(db: Session, server_id: str):
+    return db.query(models.MCPServerReplica).filter(models.MCPServerReplica.server_id == server_id)
+
+def get_replicas(db: Session, server_id: str):
+    return _replicas(db, server_id).all()
+
+def get_all_replicas(db: Session):
+    return db.query(models.MCPServerReplica).all()
+
+def set_replicas(db: Session, server_id: str, endpoint_urls: List[str]):
+    """Replace the extra endpoints of a server, keeping the rows (and ids) of unchanged ones."""
+    wanted = list(dict.fromkeys(url for url in endpoint_urls if url))
+    existing = {replica.endpoint_url: replica for replica in get_replicas(db, server_id)}
+    for url, replica in existing.items():
+        if url not in wanted:
+            db.delete(replica)
+    for url in wanted:
+        if url not in existing:
+            db.add(models.MCPServerReplica(id=str(uuid.uuid4()), server_id=server_id, endpoint_url=url, is_active=True))
+    db.commit()
+    return get_replicas(db, server_id)
+
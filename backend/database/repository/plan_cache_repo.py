@@ -0,0 +1,17 @@
+from sqlalchemy.orm import Session
+from backend.database import models
+
+
+def get_plan_cache_entry(db: Session, cache_key: str):
+    return db.query(models.PlanCacheEntry).filter(models.PlanCacheEntry.cache_key == cache_key).first()
+
+def save_plan_cache_entry(db: Session, data: dict):
+    obj = db.merge(models.PlanCacheEntry(**data))
+    db.commit(); return obj
+
+def count_plan_cache_entries(db: Session) -> int:
+    return db.query(models.PlanCacheEntry).count()
+
+def delete_all_plan_cache_entries(db: Session) -> int:
+    deleted = db.query(models.PlanCacheEntry).delete()
+    db.commit(); return deleted
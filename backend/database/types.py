@@ -0,0 +1,64 @@
+import json
+import zlib
+
+from sqlalchemy.types import Text, TypeDecorator
+
+from backend.config.settings import settings
+
+
+# Compressed values are stored as BLOBs starting with this marker; anything else
+# (plain TEXT written before compression existed, or short values) is read as-is
+COMPRESSED_MARKER = b"zlib1:"
+
+_compression = settings.chat_history.get("compression") or {}
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored zlib-compressed once it is larger than ``min_size`` bytes."""
+
+    impl = Text
+    cache_ok = True
+
+    def __init__(self, *args, enabled: bool = _compression.get("enabled", True),
+                 min_size: int = _compression.get("min_size", 256),
+                 level: int = _compression.get("level", 6), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enabled = enabled
+        self.min_size = min_size
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.enabled:
+            return value
+        data = value.encode("utf-8")
+        if len(data) < self.min_size:
+            return value
+        return COMPRESSED_MARKER + zlib.compress(data, self.level)
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, (bytes, memoryview)):
+            value = bytes(value)
+            if value.startswith(COMPRESSED_MARKER):
+                value = zlib.decompress(value[len(COMPRESSED_MARKER):])
+            return value.decode("utf-8")
+        return value
+
+
+class CompressedJSON(CompressedText):
+    """JSON column stored through ``CompressedText``; rows written by the old JSON column still decode."""
+
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return super().process_bind_param(json.dumps(value), dialect)
+
+    def process_result_value(self, value, dialect):
+        value = super().process_result_value(value, dialect)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
@@ -1,15 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from backend.adapter.http_client import http_client_pool
+from backend.adapter.openai_clients import close_openai_clients
+from backend.adapter.stdio_client import stdio_client_pool
+from backend.core.config_snapshot import config_snapshot
+from backend.core.server_selector import server_selector
 from backend.routers.chat import chat
 from backend.routers.config import config
 from backend.routers.health import health
+from backend.database.archive import dispose_archive_engines
+from backend.database.async_connection import async_engine
+from backend.database.connection import engine
+from backend.database.history_writer import chat_history_writer
 from backend.database.init_db import init_db_from_schema
+from backend.services.retention_service import retention_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    config_snapshot.refresh()
+    background_tasks = []
+    if retention_service.enabled:
+        background_tasks.append(asyncio.create_task(retention_service.run_periodically()))
+    if server_selector.health_checks_enabled:
+        background_tasks.append(asyncio.create_task(server_selector.run_periodically()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await chat_history_writer.close()
+    await http_client_pool.aclose()
+    await stdio_client_pool.aclose()
+    await close_openai_clients()
+    await async_engine.dispose()
+    engine.dispose()
+    dispose_archive_engines()
 
 
 def create_app():
     app = FastAPI(
         title="MCP Server API",
         description="LLM-driven Orchestration System",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     init_db_from_schema()
 
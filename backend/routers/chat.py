@@ -1,9 +1,11 @@
 import asyncio
 import json
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from starlette.responses import StreamingResponse
 
+from backend.database.async_connection import async_session_scope
 from backend.routers.config import UserPromptRequest
 from backend.services.chat_history_service import ChatHistoryService
 from backend.services.orchestrator_service import OrchestratorService
@@ -13,49 +15,73 @@ from backend.services.orchestrator_service import OrchestratorService
 chat = APIRouter()
 
 @chat.get("/all")
-def get_chat_sessions():
-    return ChatHistoryService.list_chat_sessions()
+def get_chat_sessions(limit: int = Query(50, ge=1, le=500), before: Optional[str] = None):
+    return ChatHistoryService.list_chat_sessions(limit, before)
+
+@chat.get("/search")
+def search_chat_history(q: str = Query(..., min_length=1, max_length=200),
+                        limit: int = Query(20, ge=1, le=100), offset: int = Query(0, ge=0)):
+    return ChatHistoryService.search(q, limit, offset)
+
+@chat.get("/messages/{message_id}/steps")
+def get_message_steps(message_id: str, session_id: Optional[str] = None):
+    steps = ChatHistoryService.load_message_steps(message_id, session_id)
+    if steps is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return steps
 
 @chat.get("/{session_id}")
-def get_chat_history(session_id: str):
-    response = ChatHistoryService.load_chat_history(session_id)
-    print(">> chat history response: ", response)
-    return response
+def get_chat_history(session_id: str, limit: Optional[int] = Query(None, ge=1, le=500),
+                     before: Optional[str] = None, include_steps: bool = False):
+    return ChatHistoryService.load_chat_history(session_id, limit, before, include_steps)
+
+@chat.get("/{session_id}/ndjson")
+def stream_chat_history(session_id: str):
+    return StreamingResponse(
+        ChatHistoryService.stream_chat_history(session_id), media_type="application/x-ndjson"
+    )
 
 @chat.post("/stream")
 async def stream_prompt(request: UserPromptRequest):
-    orchestrator = OrchestratorService()
     async def event_generator():
-        try:
-            yield f"event:status\ndata:Starting orchestration, please wait...\n\n"
-            await asyncio.sleep(0.5)  # Prevent early timeout
+        # The session is opened and closed by the stream itself: yield-dependencies
+        # are torn down before a StreamingResponse body is sent
+        async with async_session_scope() as db:
+            orchestrator = OrchestratorService(db)
+            try:
+                yield f"event:status\ndata:Starting orchestration, please wait...\n\n"
+                await asyncio.sleep(0.5)  # Prevent early timeout
             
-            # Process the orchestration steps and yield updates
-            async for update in orchestrator.run_user_prompt("user123", request.session_id, request.prompt):
-                update_type = update.get("type", "status")
-                update_data = update.get("data")
+                # Process the orchestration steps and yield updates
+                async for update in orchestrator.run_user_prompt("user123", request.session_id, request.prompt):
+                    update_type = update.get("type", "status")
+                    update_data = update.get("data")
                 
-                if update_type == "error":
-                    yield f"event:error\ndata:{json.dumps({'message': update_data})}\n\n"
-                    return
-                elif update_type == "result":
-                    yield f"event:result\ndata:{json.dumps(update_data)}\n\n"
-                elif update_type == "plan":
-                    yield f"event:plan\ndata:{json.dumps(update_data)}\n\n"
-                elif update_type == "task_complete":
-                    yield f"event:step\ndata:{json.dumps(update_data.__dict__)}\n\n"
-                else:
-                    yield f"event:{update_type}\ndata:{json.dumps({'message': update_data})}\n\n"
+                    if update_type == "error":
+                        yield f"event:error\ndata:{json.dumps({'message': update_data})}\n\n"
+                        return
+                    elif update_type == "result":
+                        yield f"event:result\ndata:{json.dumps(update_data)}\n\n"
+                    elif update_type == "plan":
+                        yield f"event:plan\ndata:{json.dumps(update_data)}\n\n"
+                    elif update_type == "task_complete":
+                        step = {**update_data.__dict__, "timings": update.get("timings") or {}}
+                        yield f"event:step\ndata:{json.dumps(step)}\n\n"
+                    elif update_type == "answer_delta":
+                        yield f"event:answer_delta\ndata:{json.dumps({'delta': update_data})}\n\n"
+                        continue  # Tokens go out as soon as they arrive, without the pacing delay
+                    else:
+                        yield f"event:{update_type}\ndata:{json.dumps({'message': update_data})}\n\n"
                 
-                # Small delay to ensure browser receives events separately
-                await asyncio.sleep(0.05)
+                    # Small delay to ensure browser receives events separately
+                    await asyncio.sleep(0.05)
                 
-        except asyncio.CancelledError:
-            print("⚠️ SSE Stream was cancelled by client or timeout.")
-            return
-        except Exception as e:
-            error_msg = str(e)
-            print(f"⚠️ Error in stream processing: {error_msg}")
-            yield f"event:error\ndata:{json.dumps({'message': error_msg})}\n\n"
+            except asyncio.CancelledError:
+                print("⚠️ SSE Stream was cancelled by client or timeout.")
+                return
+            except Exception as e:
+                error_msg = str(e)
+                print(f"⚠️ Error in stream processing: {error_msg}")
+                yield f"event:error\ndata:{json.dumps({'message': error_msg})}\n\n"
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
\ No newline at end of file
@@ -1,5 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from backend.core.plan_cache import plan_cache
+from backend.core.server_selector import server_selector
+from backend.database.connection import get_db
+from backend.services.bulk_service import ENTITIES, bulk_service
+from backend.services.retention_service import retention_service
 
 from backend.services.configuration.llm_config_service import LLMConfigService
 from backend.services.configuration.mcp_config_service import MCPConfigService
@@ -13,44 +21,86 @@ class UserPromptRequest(BaseModel):
 
 
 @config.get("/llms")
-def list_llms():
-    service = LLMConfigService()
+def list_llms(db: Session = Depends(get_db)):
+    service = LLMConfigService(db)
     return [{"id": llm.id, "name": llm.name, "api_key": llm.api_key, "base_url": llm.base_url} for llm in service.get_all()]
 
 @config.delete("/llms/{llm_id}")
-def delete_llm(llm_id: str):
-    service = LLMConfigService()
+def delete_llm(llm_id: str, db: Session = Depends(get_db)):
+    service = LLMConfigService(db)
     result = service.delete(llm_id)
     return {"message": "Deleted."} if result else {"message": "Not found."}
 
 @config.post("/llms")
-def save_llm(data: dict):
-    service = LLMConfigService()
+def save_llm(data: dict, db: Session = Depends(get_db)):
+    service = LLMConfigService(db)
     updated = service.create_or_update(data)
     return {"id": updated.id, "message": "LLM API saved."}
 
 
 @config.get("/mcp_servers")
-def list_mcp_servers():
-    service = MCPConfigService()
+def list_mcp_servers(db: Session = Depends(get_db)):
+    service = MCPConfigService(db)
+    replicas = service.get_replicas_by_server()
     return [{
         "id": s.id,
         "name": s.name,
         "keywords": s.keywords,
-        "endpoint_url": s.endpoint_url
+        "endpoint_url": s.endpoint_url,
+        "replicas": replicas.get(s.id, []),
+        "health": server_selector.status(s.endpoint_url) if s.is_active is not False else []
     } for s in service.get_all()]
 
 @config.post("/mcp_servers")
-def save_mcp_server(data: dict):
-    service = MCPConfigService()
-    updated = service.create_or_update(data)
+def save_mcp_server(data: dict, db: Session = Depends(get_db)):
+    service = MCPConfigService(db)
+    try:
+        updated = service.create_or_update(data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"id": updated.id, "message": "MCP Server saved."}
 
 @config.delete("/mcp_servers/{mcp_id}")
-def delete_mcp_server(mcp_id: str):
-    service = MCPConfigService()
+def delete_mcp_server(mcp_id: str, db: Session = Depends(get_db)):
+    service = MCPConfigService(db)
     result = service.delete(mcp_id)
     return {"message": "Deleted."} if result else {"message": "Not found."}
 
 
+@config.get("/plan_cache")
+def get_plan_cache_stats(db: Session = Depends(get_db)):
+    return plan_cache.stats(db)
+
+@config.delete("/plan_cache")
+def purge_plan_cache(db: Session = Depends(get_db)):
+    deleted = plan_cache.purge(db)
+    return {"message": f"Plan cache purged ({deleted} stored plans removed)."}
+
+
+@config.get("/retention")
+def get_retention_status():
+    return retention_service.status()
+
+@config.post("/retention/run")
+def run_retention():
+    """Archive idle sessions now instead of waiting for the periodic job."""
+    return retention_service.run_once()
+
+
+def _bulk_entity(entity: str) -> str:
+    if entity not in ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown entity '{entity}'. Use one of: {', '.join(ENTITIES)}")
+    return entity
+
+@config.get("/bulk/{entity}")
+def export_entities(entity: str = Depends(_bulk_entity)):
+    """Stream every row of ``entity`` as NDJSON."""
+    return StreamingResponse(
+        bulk_service.export_ndjson(entity), media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{entity}.ndjson"'}
+    )
 
+@config.post("/bulk/{entity}")
+async def import_entities(request: Request, entity: str = Depends(_bulk_entity)):
+    """Upsert NDJSON records (matched on id, then name) in chunked transactions."""
+    return await bulk_service.import_ndjson(entity, request.stream())
@@ -1,8 +1,16 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.core.metrics import registry
 
 
 health = APIRouter(tags=["Health Check"])
 
 @health.get("/")
 def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@health.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of latency histograms and counters."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import undefer
+
+from backend.config.settings import settings
+from backend.core.config_snapshot import config_snapshot
+from backend.database import models
+from backend.database.archive import archive_session
+from backend.database.connection import session_scope
+
+
+logger = logging.getLogger(__name__)
+
+
+class BulkEntity:
+    """A table exposed through the NDJSON bulk endpoints."""
+
+    def __init__(self, model, natural_key: Optional[str] = None, is_config: bool = True):
+        self.model = model
+        # Rows without a known id are matched on this column before being created
+        self.natural_key = natural_key
+        self.is_config = is_config
+        self.columns = [column.key for column in model.__table__.columns]
+
+
+ENTITIES: Dict[str, BulkEntity] = {
+    "mcp_servers": BulkEntity(models.MCPServer, "name"),
+    "mcp_server_replicas": BulkEntity(models.MCPServerReplica),
+    "llm_apis": BulkEntity(models.LLMAPI, "name"),
+    "prompt_contexts": BulkEntity(models.PromptContext, "name"),
+    "chat_history": BulkEntity(models.ChatHistory, is_config=False),
+}
+
+
+class BulkService:
+    """
+    NDJSON import and export. Exports stream rows ``batch_size`` at a time;
+    imports upsert ``chunk_size`` records per transaction.
+    """
+
+    MAX_REPORTED_ERRORS = 100
+
+    def __init__(self, chunk_size: int = 500, batch_size: int = 500):
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    def export_ndjson(self, name: str) -> Iterator[str]:
+        entity = ENTITIES[name]
+        with session_scope() as db:
+            yield from self._export_rows(db, entity)
+            archive_files = (
+                [row.archive_file for row in db.query(models.ArchivedSession.archive_file).distinct()]
+                if entity.model is models.ChatHistory else []
+            )
+        # Archived sessions are part of the history export too
+        for archive_file in archive_files:
+            with archive_session(archive_file) as db:
+                yield from self._export_rows(db, entity)
+
+    def _export_rows(self, db, entity: BulkEntity) -> Iterator[str]:
+        query = db.query(entity.model)
+        if entity.model is models.ChatHistory:
+            query = query.options(undefer("*"))
+        for row in query.yield_per(self.batch_size):
+            yield json.dumps({column: getattr(row, column) for column in entity.columns}) + "\n"
+
+    async def import_ndjson(self, name: str, body: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """Upsert the records of an NDJSON request body as it arrives."""
+        entity = ENTITIES[name]
+        summary = {"created": 0, "updated": 0, "failed": 0, "errors": []}
+        chunk: List[Tuple[int, dict]] = []
+        async for line_number, record in self._records(body, entity, summary):
+            chunk.append((line_number, record))
+            if len(chunk) >= self.chunk_size:
+                await self._flush(entity, chunk, summary)
+                chunk = []
+        if chunk:
+            await self._flush(entity, chunk, summary)
+        if entity.is_config and (summary["created"] or summary["updated"]):
+            config_snapshot.invalidate()
+        return summary
+
+    async def _records(self, body: AsyncIterator[bytes], entity: BulkEntity, summary: Dict[str, Any]):
+        buffer = b""
+        line_number = 0
+        async for data in body:
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                record = self._parse(line, line_number, entity, summary)
+                if record is not None:
+                    yield line_number, record
+        if buffer.strip():
+            record = self._parse(buffer, line_number + 1, entity, summary)
+            if record is not None:
+                yield line_number + 1, record
+
+    def _parse(self, line: bytes, line_number: int, entity: BulkEntity,
+               summary: Dict[str, Any]) -> Optional[dict]:
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            self._fail(summary, line_number, f"Invalid JSON: {e}")
+            return None
+        if not isinstance(record, dict):
+            self._fail(summary, line_number, "Expected a JSON object")
+            return None
+        unknown = set(record) - set(entity.columns)
+        if unknown:
+            self._fail(summary, line_number, f"Unknown fields: {', '.join(sorted(unknown))}")
+            return None
+        if isinstance(record.get("manifest"), dict):
+            record["manifest"] = json.dumps(record["manifest"])
+        return record
+
+    def _fail(self, summary: Dict[str, Any], line_number: int, error: str):
+        summary["failed"] += 1
+        if len(summary["errors"]) < self.MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line_number, "error": error})
+
+    async def _flush(self, entity: BulkEntity, chunk: List[Tuple[int, dict]], summary: Dict[str, Any]):
+        try:
+            created, updated = await asyncio.to_thread(self._upsert_chunk, entity, [record for _, record in chunk])
+        except Exception as e:
+            logger.warning(f"Bulk import chunk failed: {e}")
+            for line_number, _ in chunk:
+                self._fail(summary, line_number, f"Chunk rolled back: {e}")
+            return
+        summary["created"] += created
+        summary["updated"] += updated
+
+    def _upsert_chunk(self, entity: BulkEntity, records: List[dict]) -> Tuple[int, int]:
+        """
+        One transaction per chunk, with one lookup by id and one by natural key.
+        Messages of archived sessions are written back to their archive file rather
+        than the hot table, so exporting and re-importing a database round-trips them.
+        """
+        with session_scope() as db:
+            archived: Dict[str, List[dict]] = {}
+            if entity.model is models.ChatHistory:
+                records, archived = self._split_archived(db, records)
+            created, updated = self._upsert(db, entity, records)
+            for archive_file, archive_records in archived.items():
+                with archive_session(archive_file) as archive_db:
+                    archive_created, archive_updated = self._upsert(archive_db, entity, archive_records)
+                    self._refresh_archive_index(db, archive_db, archive_records)
+                created += archive_created
+                updated += archive_updated
+        return created, updated
+
+    @staticmethod
+    def _split_archived(db, records: List[dict]) -> Tuple[List[dict], Dict[str, List[dict]]]:
+        """Separate the messages of archived sessions, by archive file; rows already in the hot table stay there."""
+        session_ids = {record.get("session_id") for record in records if record.get("session_id")}
+        if not session_ids:
+            return records, {}
+        files = {row.session_id: row.archive_file for row in
+                 db.query(models.ArchivedSession).filter(models.ArchivedSession.session_id.in_(session_ids))}
+        if not files:
+            return records, {}
+        ids = [record["id"] for record in records if record.get("id")]
+        hot_ids = {row.id for row in db.query(models.ChatHistory.id).filter(models.ChatHistory.id.in_(ids))} if ids else set()
+        hot, archived = [], {}
+        for record in records:
+            archive_file = files.get(record.get("session_id"))
+            if archive_file and record.get("id") not in hot_ids:
+                archived.setdefault(archive_file, []).append(record)
+            else:
+                hot.append(record)
+        return hot, archived
+
+    @staticmethod
+    def _refresh_archive_index(db, archive_db, records: List[dict]):
+        """Keep ``archive_index`` counts in step with messages added to an archive file."""
+        history = models.ChatHistory
+        for session_id in {record["session_id"] for record in records}:
+            message_count, last_activity = (
+                archive_db.query(func.count(history.id), func.max(history.created_at))
+                .filter(history.session_id == session_id).one()
+            )
+            archived = db.get(models.ArchivedSession, session_id)
+            archived.message_count = message_count
+            archived.last_activity = last_activity or archived.last_activity
+        db.commit()
+
+    @staticmethod
+    def _upsert(db, entity: BulkEntity, records: List[dict]) -> Tuple[int, int]:
+        model = entity.model
+        ids = [record["id"] for record in records if record.get("id")]
+        by_id = {obj.id: obj for obj in db.query(model).filter(model.id.in_(ids))} if ids else {}
+        by_key = {}
+        if entity.natural_key:
+            key_column = getattr(model, entity.natural_key)
+            keys = [record[entity.natural_key] for record in records
+                    if record.get(entity.natural_key) and record.get("id") not in by_id]
+            if keys:
+                by_key = {getattr(obj, entity.natural_key): obj
+                          for obj in db.query(model).filter(key_column.in_(keys))}
+
+        created = updated = 0
+        for record in records:
+            existing = by_id.get(record.get("id")) or by_key.get(record.get(entity.natural_key))
+            if existing is not None:
+                for key, value in record.items():
+                    if key != "id":
+                        setattr(existing, key, value)
+                updated += 1
+            else:
+                obj = model(**{"id": str(uuid.uuid4()), **record})
+                db.add(obj)
+                by_id[obj.id] = obj
+                if entity.natural_key and record.get(entity.natural_key):
+                    by_key[record[entity.natural_key]] = obj
+                created += 1
+        db.commit()
+        return created, updated
+
+bulk_service = BulkService(
+    chunk_size=settings.bulk.get("chunk_size", 500),
+    batch_size=settings.bulk.get("export_batch_size", 500),
+)
@@ -1,33 +1,175 @@
-from typing import List, Dict, Any, Union
-from backend.database.connection import SessionLocal
-from backend.database.models import ChatHistory
-from backend.database.repository import chat_history_repo
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
+from backend.database.archive import archive_session
+from backend.database.connection import session_scope
+from backend.database.repository import archive_index_repo, chat_history_repo
 import json
+import re
 
 
 class ChatHistoryService:
 
+    STREAM_BATCH_SIZE = 100
+
+    @staticmethod
+    def load_chat_history(session_id: str, limit: Optional[int] = None, before: Optional[str] = None,
+                          include_steps: bool = False):
+        """
+        Messages of a session, oldest first. With ``limit``, only the page of
+        messages preceding the ``before`` cursor (the newest page by default).
+        Steps are left out (``None``) unless ``include_steps`` is set; fetch them
+        per message with ``load_message_steps``.
+        """
+        with session_scope() as db:
+            messages = ChatHistoryService._load_messages(db, session_id, limit, before, include_steps)
+            archive_file = ChatHistoryService._archive_file(db, session_id)
+        if archive_file and (limit is None or len(messages) < limit):
+            # Archived messages are all older than the ones still in the hot table
+            remaining = None if limit is None else limit - len(messages)
+            with archive_session(archive_file) as db:
+                messages = ChatHistoryService._load_messages(
+                    db, session_id, remaining, before, include_steps
+                ) + messages
+        return messages
+
+    @staticmethod
+    def _load_messages(db, session_id: str, limit: Optional[int], before: Optional[str],
+                       include_steps: bool) -> List[Dict[str, Any]]:
+        if limit is None:
+            rows = chat_history_repo.get_chat_history_by_session(db, session_id, include_steps)
+        else:
+            rows = chat_history_repo.get_chat_history_page(
+                db, session_id, limit, ChatHistoryService._decode_cursor(before), include_steps
+            )
+        return [ChatHistoryService._to_message(row, include_steps) for row in rows]
+
+    @staticmethod
+    def _archive_file(db, session_id: str) -> Optional[str]:
+        archived = archive_index_repo.get_archived_session(db, session_id)
+        return archived.archive_file if archived else None
+
+    @staticmethod
+    def load_message_steps(message_id: str, session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        The steps and MCP requests of one message, decoded on demand. Messages of
+        archived sessions are found when their ``session_id`` is given.
+        """
+        with session_scope() as db:
+            row = chat_history_repo.get_message_steps(db, message_id)
+            archive_file = ChatHistoryService._archive_file(db, session_id) if row is None and session_id else None
+        if archive_file:
+            with archive_session(archive_file) as db:
+                row = chat_history_repo.get_message_steps(db, message_id)
+        if row is None:
+            return None
+        return {
+            "id": row.id,
+            "steps": ChatHistoryService._decode_steps(row.steps),
+            "requests": ChatHistoryService._decode_steps(row.requests)
+        }
+
+    @staticmethod
+    def stream_chat_history(session_id: str) -> Iterator[str]:
+        """Yield a session's messages as NDJSON lines without loading the whole session."""
+        # The generator owns its sessions, so they stay open for the whole response body
+        with session_scope() as db:
+            archive_file = ChatHistoryService._archive_file(db, session_id)
+        if archive_file:
+            with archive_session(archive_file) as db:
+                yield from ChatHistoryService._ndjson_lines(db, session_id)
+        with session_scope() as db:
+            yield from ChatHistoryService._ndjson_lines(db, session_id)
+
+    @staticmethod
+    def _ndjson_lines(db, session_id: str) -> Iterator[str]:
+        rows = chat_history_repo.iter_chat_history_by_session(db, session_id, ChatHistoryService.STREAM_BATCH_SIZE)
+        for row in rows:
+            yield json.dumps(ChatHistoryService._to_message(row)) + "\n"
+
+    @staticmethod
+    def _to_message(row, include_steps: bool = True) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "created_at": row.created_at,
+            "cursor": f"{row.created_at}|{row.id}",
+            "user_prompt": row.original_prompt,
+            "steps": ChatHistoryService._decode_steps(row.steps) if include_steps else None,
+            "final_answer": row.final_response
+        }
+
     @staticmethod
-    def load_chat_history(session_id: str):
-        db = SessionLocal()
-        rows = chat_history_repo.get_chat_history_by_session(db, session_id)
-        db.close()
+    def _decode_steps(value) -> List[Any]:
+        # Very old rows may hold the JSON document itself as a string
+        return json.loads(value) if value and isinstance(value, str) else value or []
+
+    @staticmethod
+    def list_chat_sessions(limit: int = 50, before: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        One page of sessions, most recently active first. Pass the ``cursor`` of
+        the last returned session as ``before`` to get the next page.
+        """
+        cursor = ChatHistoryService._decode_cursor(before)
+        with session_scope() as db:
+            # Both lists use the same keyset, so merging their pages gives the page of the union
+            rows = chat_history_repo.list_sessions(db, limit, cursor) + \
+                archive_index_repo.list_archived_sessions(db, limit, cursor)
+            rows = sorted(rows, key=lambda row: (row.last_activity, row.session_id), reverse=True)[:limit]
+            return [{
+                    "session_id": row.session_id,
+                    "session_title": row.session_title or "(Untitled Session)",
+                    "last_activity": row.last_activity,
+                    "cursor": f"{row.last_activity}|{row.session_id}"
+                } for row in rows
+            ]
+
+    @staticmethod
+    def search(query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search over prompts, answers and session titles, in the
+        hot table and every archive file.
+        """
+        match = ChatHistoryService._fts_query(query)
+        if not match:
+            return []
+        # Each index returns its own best hits; the requested page is cut from their union
+        with session_scope() as db:
+            rows = chat_history_repo.search_chat_history(db, match, limit + offset)
+            archive_files = archive_index_repo.list_archive_files(db)
+        for archive_file in archive_files:
+            with archive_session(archive_file) as db:
+                rows += chat_history_repo.search_chat_history(db, match, limit + offset)
+        unique = {}
+        for row in sorted(rows, key=lambda row: row.score):
+            unique.setdefault(row.id, row)
+        rows = list(unique.values())[offset:offset + limit]
         return [{
-                "user_prompt": row.original_prompt,
-                "steps": json.loads(row.steps) if row.steps and not isinstance(row.steps, list) else row.steps or [],
-                "final_answer": row.final_response
+                "message_id": row.id,
+                "session_id": row.session_id,
+                "session_title": row.session_title or "(Untitled Session)",
+                "created_at": row.created_at,
+                "prompt_snippet": row.prompt_snippet,
+                "answer_snippet": row.answer_snippet,
+                "score": row.score
             } for row in rows
         ]
 
     @staticmethod
-    def list_chat_sessions() -> List[Dict[str, str]]:
-        db = SessionLocal()
-        rows = (
-            db.query(ChatHistory.session_id, ChatHistory.session_title)
-            .order_by(ChatHistory.created_at.desc())
-            .distinct()
-            .all()
-        )
-        db.close()
-        return [{"session_id": row.session_id, "session_title": row.session_title or "(Untitled Session)"} for row in rows]
+    def _fts_query(query: str) -> str:
+        """
+        Turn user input into a safe FTS5 expression: every word is quoted, so
+        operators and syntax characters are matched literally, and the last word
+        is a prefix so results follow the user's typing.
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return ""
+        terms = [f'"{word}"' for word in words]
+        terms[-1] += "*"
+        return " ".join(terms)
 
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+        """Split a ``"<timestamp>|<id>"`` keyset cursor."""
+        if not cursor or "|" not in cursor:
+            return None
+        timestamp, key = cursor.rsplit("|", 1)
+        return timestamp, key
@@ -1,7 +1,25 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.database.connection import session_scope
 
 class ConfigService(ABC):
 
+    def __init__(self, db: Optional[Session] = None):
+        # A request-scoped session from the router; without one, each call opens its own
+        self.db = db
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        if self.db is not None:
+            yield self.db
+        else:
+            with session_scope() as db:
+                yield db
+
     @abstractmethod
     def get_all(self):
         pass
@@ -1,46 +1,66 @@
 import json
+from typing import Dict, List, Optional
 
-from backend.database.connection import SessionLocal
+from backend.adapter.stdio_client import stdio_client_pool
 from backend.database.repository import mcp_server_repo
+from backend.core.config_snapshot import config_snapshot
 from backend.services.config_service_base import ConfigService
 
 class MCPConfigService(ConfigService):
 
     def get_all(self):
-        db = SessionLocal()
-        result = mcp_server_repo.get_all_mcp_servers(db)
-        db.close()
-        return result
+        with self._session() as db:
+            return mcp_server_repo.get_all_mcp_servers(db)
 
     def get_by_id(self, mcp_id: str):
-        db = SessionLocal()
-        result = mcp_server_repo.get_mcp_server(db, mcp_id)
-        db.close()
-        return result
+        with self._session() as db:
+            return mcp_server_repo.get_mcp_server(db, mcp_id)
+
+    def get_replicas_by_server(self) -> Dict[str, List[str]]:
+        with self._session() as db:
+            replicas: Dict[str, List[str]] = {}
+            for replica in mcp_server_repo.get_all_replicas(db):
+                replicas.setdefault(replica.server_id, []).append(replica.endpoint_url)
+            return replicas
 
     def create_or_update(self, data: dict):
-        db = SessionLocal()
-        existing = None
+        # Replicas are kept in their own table; leaving the key out keeps the current ones
+        replicas = data.pop("replicas", None)
+        with self._session() as db:
+            existing = None
 
-        if isinstance(data.get("manifest"), dict):
-            data["manifest"] = json.dumps(data["manifest"])
+            if isinstance(data.get("manifest"), dict):
+                data["manifest"] = json.dumps(data["manifest"])
 
-        if data.get("id"):
-            existing = mcp_server_repo.get_mcp_server(db, data["id"])
-        if not existing and data.get("name"):
-            existing = mcp_server_repo.get_mcp_server_by_name(db, data["name"])
+            if data.get("id"):
+                existing = mcp_server_repo.get_mcp_server(db, data["id"])
+            if not existing and data.get("name"):
+                existing = mcp_server_repo.get_mcp_server_by_name(db, data["name"])
 
-        if existing:
-            updated = mcp_server_repo.update_mcp_server(db, existing.id, data)
-        else:
-            updated = mcp_server_repo.create_mcp_server(db, data)
+            if replicas is not None:
+                self._check_replicas(data.get("endpoint_url") or (existing and existing.endpoint_url), replicas)
 
-        db.close()
+            if existing:
+                updated = mcp_server_repo.update_mcp_server(db, existing.id, data)
+            else:
+                updated = mcp_server_repo.create_mcp_server(db, data)
+            if replicas is not None:
+                mcp_server_repo.set_replicas(db, updated.id, [url for url in replicas if url != updated.endpoint_url])
+        config_snapshot.invalidate()
         return updated
 
 
     def delete(self, mcp_id: str):
-        db = SessionLocal()
-        result = mcp_server_repo.delete_mcp_server(db, mcp_id)
-        db.close()
+        with self._session() as db:
+            result = mcp_server_repo.delete_mcp_server(db, mcp_id)
+        config_snapshot.invalidate()
         return result
+
+    @staticmethod
+    def _check_replicas(endpoint_url: Optional[str], replicas):
+        if not isinstance(replicas, list) or not all(isinstance(url, str) for url in replicas):
+            raise ValueError("replicas must be a list of endpoint URLs")
+        # The executor is chosen from the primary endpoint, so every replica has to speak the same transport
+        transports = {stdio_client_pool.is_stdio(url) for url in replicas + ([endpoint_url] if endpoint_url else [])}
+        if len(transports) > 1:
+            raise ValueError("stdio:// and HTTP endpoints cannot be replicas of the same server")
@@ -1,12 +1,12 @@
 
-from backend.database.repository import prompt_context_repo
+from backend.core.config_snapshot import config_snapshot
 from backend.services.context_resolver.base_context_resolver import ContextResolver
 
 
 class KeywordContextResolver(ContextResolver):
     def resolve(self, db, prompt: str):
-        for ctx in prompt_context_repo.get_all_prompt_contexts(db):
+        # Prompt contexts come from the in-memory snapshot; ``db`` is kept for the interface
+        for ctx in config_snapshot.current().prompt_contexts:
             if ctx.name.lower() in prompt.lower():
                 return ctx
         return None
-
@@ -1,4 +1,5 @@
 import json
+from typing import AsyncIterator, Tuple
 
 from backend.adapter.llm_factory import get_llm_client
 from backend.services.llm_refiner.base_llm_refiner import LLMRefiner
@@ -8,14 +9,28 @@ class OpenAILLMRefiner(LLMRefiner):
     def __init__(self, api_key: str):
         self.client = get_llm_client("openai-a", api_key)
 
-    def refine(self, prompt: str, context: dict) -> str:
-        return self.client.complete(prompt, context)
+    async def refine(self, prompt: str, context: dict) -> str:
+        return await self.client.acomplete(prompt, context)
 
-    def post_process(self, output: str, context: dict) -> str:
-        return self.client.complete(output, context)
+    async def post_process(self, output: str, context: dict) -> str:
+        return await self.client.acomplete(output, context)
 
-    def pick_prompt_context(self, prompt_text: str, context_list: dict) -> str:
+    async def pick_prompt_context(self, prompt_text: str, context_list: dict) -> str:
         """LLM picks the best matching prompt_context id based on prompt_text"""
+        prompt, context = self._summary_request(prompt_text, context_list)
+        response = await self.refine(prompt, context)
+
+        result = response.strip().replace('"', '')  # In case LLM returns the id wrapped in quotes
+        return result
+
+    async def stream_prompt_context(self, prompt_text: str, context_list: dict) -> AsyncIterator[str]:
+        """Streaming variant of ``pick_prompt_context`` that yields the summary as it is generated."""
+        prompt, context = self._summary_request(prompt_text, context_list)
+        async for delta in self.client.astream(prompt, context):
+            yield delta.replace('"', '')
+
+    @staticmethod
+    def _summary_request(prompt_text: str, context_list: dict) -> Tuple[str, dict]:
         system_instruction = (
             "You are a smart summarizer. Given a series of steps and responses, "
             "generate a friendly natural language summary for the user. "
@@ -29,9 +44,4 @@ class OpenAILLMRefiner(LLMRefiner):
         {json.dumps(context_list, indent=2)}
         """
 
-        response = self.refine(prompt, {
-            "system": system_instruction
-        })
-
-        result = response.strip().replace('"', '')  # In case LLM returns the id wrapped in quotes
-        return result
+        return prompt, {"system": system_instruction}
@@ -5,5 +5,5 @@ from typing import Any, Dict
 class MCPExecutor(ABC):
 
     @abstractmethod
-    async def execute(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, endpoint: str, payload: Dict[str, Any], action: str = "process") -> Dict[str, Any]:
         pass
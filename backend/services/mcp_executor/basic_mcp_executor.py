@@ -1,18 +1,81 @@
-from typing import Dict, Any
-
-import httpx
+import json
+from typing import Dict, Any, Optional
 
+from backend.adapter.http_client import http_client_pool
+from backend.config.settings import settings
+from backend.core.manifest_cache import manifest_cache
+from backend.core.result_cache import find_action, is_cacheable, make_result_key, mcp_result_cache
+from backend.core.server_selector import server_selector
 from backend.services.mcp_executor.base_mcp_executor import MCPExecutor
+from backend.services.mcp_executor.batch_coalescer import BatchCoalescer
+
+
+async def _send_action(replica: str, action: str, body: Dict[str, Any]) -> Any:
+    client, url = http_client_pool.resolve(f"{replica}/{action}")
+    resp = await client.post(url, json=body)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _post_action(endpoint: str, action: str, body: Dict[str, Any]) -> Any:
+    try:
+        return await server_selector.call(endpoint, lambda replica: _send_action(replica, action, body))
+    except Exception as e:
+        return {"error": f"Failed to call MCP server {endpoint}: {str(e)}"}
+
+
+# Shared by every executor so calls from concurrent sessions coalesce too
+batch_coalescer = BatchCoalescer(
+    _post_action,
+    window_ms=settings.mcp_batching.get("window_ms", 5),
+    max_batch_size=settings.mcp_batching.get("max_batch_size", 50),
+)
 
 
 class BasicMCPExecutor(MCPExecutor):
 
-    async def execute(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                resp = await client.post(f"{endpoint}/process", json=payload)
-                resp.raise_for_status()
-                return resp.json()
-        except Exception as e:
-            return {"error": f"Failed to call MCP server {endpoint}: {str(e)}"}
+    async def execute(self, endpoint: str, payload: Dict[str, Any], action: str = "process") -> Dict[str, Any]:
+        manifest = manifest_cache.peek(endpoint)
+        cache_key, cache_ttl = self._result_cache_policy(manifest, endpoint, action, payload)
+        if cache_key is not None:
+            cached = mcp_result_cache.get(cache_key)
+            if cached is not None:
+                return json.loads(cached)
+
+        batch_entry = self._batch_action_for(manifest, action)
+        if batch_entry is not None:
+            result = await batch_coalescer.submit(
+                endpoint, action, batch_entry["name"], payload, batch_entry.get("max_batch_size")
+            )
+        else:
+            result = await self._call(endpoint, action, payload)
+
+        if cache_key is not None and not (isinstance(result, dict) and "error" in result):
+            mcp_result_cache.set(cache_key, json.dumps(result), ttl=cache_ttl)
+        return result
+
+    async def _call(self, endpoint: str, action: str, payload: Dict[str, Any]) -> Any:
+        """Send one request to the server; subclasses swap the transport."""
+        return await _post_action(endpoint, action, payload)
+
+    @staticmethod
+    def _result_cache_policy(manifest: Optional[Dict[str, Any]], endpoint: str, action: str,
+                             payload: Dict[str, Any]):
+        """Return ``(cache_key, ttl)`` when the server declares ``action`` deterministic, else ``(None, None)``."""
+        if not settings.mcp_result_cache.get("enabled", True):
+            return None, None
+        action_entry = find_action(manifest, action)
+        if not is_cacheable(action_entry):
+            return None, None
+        ttl: Optional[float] = action_entry.get("cache_ttl")
+        return make_result_key(endpoint, action, payload), ttl
 
+    @staticmethod
+    def _batch_action_for(manifest: Optional[Dict[str, Any]], action: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest entry of the batch action that serves ``action``, if batching is on."""
+        if not settings.mcp_batching.get("enabled", True):
+            return None
+        for entry in (manifest or {}).get("actions") or []:
+            if entry.get("batch_for") == action:
+                return entry
+        return None
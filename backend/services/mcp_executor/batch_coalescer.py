@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+
+# send(endpoint, action, body) -> decoded JSON response, or {"error": ...}
+Sender = Callable[[str, str, Dict[str, Any]], Awaitable[Any]]
+
+
+class BatchCoalescer:
+    """
+    Groups concurrent calls to the same endpoint and action into one request to
+    the server's batch action.
+
+    The first call for a key opens a short window (``window_ms``). Calls that
+    arrive during the window join the same batch, which is flushed when the
+    window closes or ``max_batch_size`` is reached. A batch of one is sent as a
+    plain call, and a failed batch request is retried item by item.
+    """
+
+    def __init__(self, send: Sender, window_ms: float = 5, max_batch_size: int = 50):
+        self.send = send
+        self.window = window_ms / 1000
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._pending: Dict[Tuple[str, str, str], List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[str, str, str], asyncio.TimerHandle] = {}
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def submit(self, endpoint: str, action: str, batch_action: str,
+                     payload: Dict[str, Any], max_batch_size: int = None) -> Any:
+        loop = asyncio.get_running_loop()
+        key = (endpoint, action, batch_action)
+        future = loop.create_future()
+        queue = self._pending.setdefault(key, [])
+        queue.append((payload, future))
+
+        limit = min(self.max_batch_size, max_batch_size or self.max_batch_size)
+        if len(queue) >= limit:
+            self._flush_now(key)
+        elif len(queue) == 1:
+            self._timers[key] = loop.call_later(self.window, self._flush_now, key)
+        return await future
+
+    def _flush_now(self, key: Tuple[str, str, str]):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, [])
+        if items:
+            task = asyncio.create_task(self._flush(key, items))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, key: Tuple[str, str, str], items: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        endpoint, action, batch_action = key
+        try:
+            if len(items) == 1:
+                results = [await self.send(endpoint, action, items[0][0])]
+            else:
+                response = await self.send(endpoint, batch_action, {"items": [payload for payload, _ in items]})
+                results = response.get("results") if isinstance(response, dict) else None
+                if not isinstance(results, list) or len(results) != len(items):
+                    results = await asyncio.gather(*(self.send(endpoint, action, payload) for payload, _ in items))
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,20 @@
+from typing import Any, Dict
+
+from backend.adapter.stdio_client import stdio_client_pool
+from backend.services.mcp_executor.base_mcp_executor import MCPExecutor
+from backend.services.mcp_executor.basic_mcp_executor import BasicMCPExecutor
+from backend.services.mcp_executor.stdio_mcp_executor import StdioMCPExecutor
+
+
+class RoutingMCPExecutor(MCPExecutor):
+    """Pick the executor from the endpoint scheme: ``stdio://`` or HTTP (including ``inproc://``)."""
+
+    def __init__(self):
+        self.http_executor = BasicMCPExecutor()
+        self.stdio_executor = StdioMCPExecutor()
+
+    def executor_for(self, endpoint: str) -> MCPExecutor:
+        return self.stdio_executor if stdio_client_pool.is_stdio(endpoint) else self.http_executor
+
+    async def execute(self, endpoint: str, payload: Dict[str, Any], action: str = "process") -> Dict[str, Any]:
+        return await self.executor_for(endpoint).execute(endpoint, payload, action)
@@ -0,0 +1,26 @@
+from typing import Any, Dict, Optional
+
+from backend.adapter.stdio_client import StdioRPCError, stdio_client_pool
+from backend.core.server_selector import server_selector
+from backend.services.mcp_executor.basic_mcp_executor import BasicMCPExecutor
+
+
+class StdioMCPExecutor(BasicMCPExecutor):
+    """
+    Executor for ``stdio://package.module`` servers. Calls are JSON-RPC requests
+    (method = action name) multiplexed over a pool of long-lived subprocesses;
+    result caching works as for HTTP servers.
+    """
+
+    async def _call(self, endpoint: str, action: str, payload: Dict[str, Any]) -> Any:
+        try:
+            return await server_selector.call(
+                endpoint, lambda replica: stdio_client_pool.request(replica, action, payload)
+            )
+        except (StdioRPCError, TimeoutError, OSError) as e:
+            return {"error": f"Failed to call MCP server {endpoint}: {str(e) or type(e).__name__}"}
+
+    @staticmethod
+    def _batch_action_for(manifest: Optional[Dict[str, Any]], action: str) -> Optional[Dict[str, Any]]:
+        # Requests already share the pipes concurrently, so there is nothing to coalesce
+        return None
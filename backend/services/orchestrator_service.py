@@ -1,15 +1,22 @@
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
-import httpx
-from backend.database.connection import SessionLocal
-from backend.database.repository import (
-    mcp_server_repo, llm_api_repo, chat_history_repo
-)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config.settings import settings
+from backend.core.config_snapshot import ConfigSnapshot, config_snapshot
+from backend.core.manifest_cache import manifest_cache
+from backend.core.metrics import LLM_LATENCY, MCP_LATENCY, PLANS_TOTAL, RequestTimings, observe
+from backend.core.plan_cache import plan_cache
+from backend.database.history_writer import chat_history_writer
+from backend.database.repository import async_chat_history_repo
 from backend.services.llm_refiner.openai_llm_refiner import OpenAILLMRefiner
-from backend.services.mcp_executor.basic_mcp_executor import BasicMCPExecutor
+from backend.services.mcp_executor.routing_mcp_executor import RoutingMCPExecutor
+from backend.services.plan_executor.dag_plan_executor import DAGPlanExecutor
+from backend.services.planner.rule_based_planner import RuleBasedPlanner
 from backend.services.response_formatter.markdown_response_formatter import MarkdownResponseFormatter
 
 
@@ -38,15 +45,27 @@ class LLMError(OrchestratorServiceError):
     pass
 
 
+# Rules are compiled lazily and reused across requests
+rule_planner = RuleBasedPlanner()
+
+
 class OrchestratorService:
-    MANIFEST_TIMEOUT = 5
     MAX_TITLE_LENGTH = 40
     SHORT_TITLE_LENGTH = 25
-
-    def __init__(self):
-        self.db = SessionLocal()
-        self.mcp_executor = BasicMCPExecutor()
+    MAX_CONCURRENT_TASKS = 4
+
+    def __init__(self, db: AsyncSession):
+        # Owned by the caller, which closes it when the request (or stream) ends
+        self.db = db
+        self.config: Optional[ConfigSnapshot] = None
+        self.mcp_executor = RoutingMCPExecutor()
+        self.plan_executor = DAGPlanExecutor(
+            settings.orchestrator.get("max_concurrent_tasks", self.MAX_CONCURRENT_TASKS)
+        )
         self.response_formatter = MarkdownResponseFormatter()
+        self.stream_final_answer = settings.orchestrator.get("stream_final_answer", True)
+        self.rule_planner = rule_planner if settings.planner.get("rule_based", True) else None
+        self.template_summary = settings.planner.get("template_summary", True)
 
     
     async def run_user_prompt(self, user_id: str, session_id: str, prompt_text: str):
@@ -54,42 +73,92 @@ class OrchestratorService:
         Process a user prompt through the orchestration pipeline.
         Returns an async generator that yields updates at various stages.
         """
+        timings = RequestTimings()
         try:
+            # One snapshot for the whole request: no configuration I/O on this path
+            self.config = config_snapshot.current()
+
             # Initial status update
             yield {"type": "status", "data": "Initializing LLM refiner"}
-            llm_refiner = self._initialize_llm_refiner()
+            with timings.span("llm_init"):
+                llm_refiner = self._initialize_llm_refiner()
             
             yield {"type": "status", "data": "Gathering MCP server information"}
-            mcp_info = await self._get_mcp_server_info()
+            with timings.span("manifests"):
+                mcp_info = await self._get_mcp_server_info()
             
             yield {"type": "status", "data": "Processing prompt"}
-            enriched_prompt = self._process_prompt(prompt_text, llm_refiner, mcp_info)
-            yield {"type": "status", "data": "Generating execution plan"}
+            with timings.span("planning"):
+                enriched_prompt, plan_source = await self._process_prompt(prompt_text, llm_refiner, mcp_info)
+            PLANS_TOTAL.inc(source=plan_source)
+            yield {"type": "status", "data": f"Generating execution plan ({plan_source} planner)"}
             mcp_plan = self._parse_mcp_plan(enriched_prompt)
             yield {"type": "plan", "data": mcp_plan}
             
-            # Execute tasks with progress updates
+            # Execute independent tasks concurrently, reporting progress in plan order
             steps = []
-            for i, task in enumerate(mcp_plan):
-                yield {"type": "task_start", "data": f"Executing task {i+1}/{len(mcp_plan)}: {task['server_name']}"}
-                step = await self._execute_single_task_with_context(task, steps, llm_refiner)
-                steps.append(step)
-                yield {"type": "task_complete", "data": step}
+            # Measured from the tasks themselves so time spent delivering events is not counted
+            execution_started = time.perf_counter()
+            execution_finished = [execution_started]
+
+            async def run_task(task: Dict[str, Any], dependencies: Dict[int, Tuple[ExecutionStep, Dict[str, float]]]
+                               ) -> Tuple[ExecutionStep, Dict[str, float]]:
+                dependency_steps = {index: step for index, (step, _) in dependencies.items()}
+                outcome = await self._execute_single_task_with_context(task, dependency_steps, llm_refiner)
+                execution_finished[0] = max(execution_finished[0], time.perf_counter())
+                return outcome
+
+            async for event, i, data in self.plan_executor.run(mcp_plan, run_task):
+                if event == "task_start":
+                    yield {"type": "task_start", "data": f"Executing task {i+1}/{len(mcp_plan)}: {data['server_name']}"}
+                else:
+                    if event == "task_error":
+                        step, task_timings = ExecutionStep(
+                            server_name=mcp_plan[i].get("server_name"),
+                            request=mcp_plan[i].get("payload"),
+                            response={"error": data}
+                        ), {}
+                    else:
+                        step, task_timings = data
+                    steps.append(step)
+                    # Timings travel next to the step so they never reach the summarizer or the saved history
+                    yield {"type": "task_complete", "data": step, "timings": task_timings}
+            timings.record("mcp_execution", execution_finished[0] - execution_started)
 
             yield {"type": "status", "data": "Formatting final response"}
-            formatted_response = self._format_final_response(steps, llm_refiner)
-
-            self._save_chat_history(
-                user_id=user_id,
-                session_id=session_id,
-                prompt_text=prompt_text,
-                enriched_prompt=enriched_prompt,
-                steps=steps,
-                mcp_plan=mcp_plan,
-                formatted_response=formatted_response
-            )
-
-            final_payload = self._create_final_payload(session_id, steps, formatted_response)
+            template_answer = self._template_final_response(plan_source, mcp_plan, steps)
+            if template_answer is not None:
+                formatted_response = self.response_formatter.format(template_answer, {})
+                if self.stream_final_answer:
+                    yield {"type": "answer_delta", "data": formatted_response}
+            elif self.stream_final_answer:
+                answer_chunks = []
+                summarize_started = time.perf_counter()
+                async for delta in self._stream_final_response(steps, llm_refiner):
+                    if not answer_chunks:
+                        timings.record("summarize_first_token", time.perf_counter() - summarize_started)
+                    answer_chunks.append(delta)
+                    yield {"type": "answer_delta", "data": delta}
+                timings.record("summarize", time.perf_counter() - summarize_started)
+                LLM_LATENCY.observe(time.perf_counter() - summarize_started, operation="summarize")
+                formatted_response = self.response_formatter.format("".join(answer_chunks), {})
+            else:
+                with timings.span("summarize"):
+                    formatted_response = await self._format_final_response(steps, llm_refiner)
+
+            with timings.span("history_save"):
+                await self._save_chat_history(
+                    user_id=user_id,
+                    session_id=session_id,
+                    prompt_text=prompt_text,
+                    enriched_prompt=enriched_prompt,
+                    steps=steps,
+                    mcp_plan=mcp_plan,
+                    formatted_response=formatted_response
+                )
+
+            final_payload = self._create_final_payload(session_id, steps, formatted_response, plan_source)
+            final_payload["timings"] = timings.finish()
             yield {"type": "result", "data": final_payload}
 
         except Exception as e:
@@ -103,21 +172,41 @@ class OrchestratorService:
 
     async def _get_mcp_server_info(self) -> List[Dict[str, Any]]:
         """Retrieve and validate MCP server information."""
-        mcp_servers = mcp_server_repo.get_all_mcp_servers(self.db)
-        mcp_info = await self._prepare_mcp_server_info(mcp_servers)
+        mcp_info = await self._prepare_mcp_server_info(self.config.mcp_servers)
         
         if not mcp_info:
             raise MCPServerError("No MCP servers available")
         return mcp_info
 
-    def _process_prompt(self, prompt_text: str, llm_refiner: OpenAILLMRefiner, 
-                       mcp_info: List[Dict[str, Any]]) -> str:
-        """Process the user prompt with system instructions and MCP server info."""
+    async def _process_prompt(self, prompt_text: str, llm_refiner: OpenAILLMRefiner, 
+                       mcp_info: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """
+        Process the user prompt with system instructions and MCP server info.
+        Returns the plan JSON and the tier that produced it: "rule", "cache" or "llm".
+        """
+        if self.rule_planner:
+            rule_plan = self.rule_planner.plan(prompt_text, mcp_info)
+            if rule_plan is not None:
+                return json.dumps(rule_plan), "rule"
+
         system_instruction = self._get_system_instruction()
-        return llm_refiner.refine(prompt_text, {
-            "system": system_instruction,
-            "mcp_servers": mcp_info
-        })
+        key_parts = plan_cache.make_key(prompt_text, mcp_info, system_instruction)
+        cached_plan = await plan_cache.get(self.db, key_parts["cache_key"])
+        if cached_plan is not None:
+            logger.debug(f"Plan cache hit for prompt: {prompt_text}")
+            return cached_plan, "cache"
+
+        with observe(LLM_LATENCY, operation="plan"):
+            enriched_prompt = await llm_refiner.refine(prompt_text, {
+                "system": system_instruction,
+                "mcp_servers": mcp_info
+            })
+        try:
+            self._parse_mcp_plan(enriched_prompt)
+        except LLMError:
+            return enriched_prompt, "llm"  # never cache a plan that does not parse
+        await plan_cache.put(self.db, key_parts, enriched_prompt)
+        return enriched_prompt, "llm"
 
     def _parse_mcp_plan(self, enriched_prompt: str) -> List[Dict[str, Any]]:
         """Parse the LLM-generated plan from the enriched prompt."""
@@ -157,10 +246,12 @@ class OrchestratorService:
             payload["previous_result"] = previous_results[-1]
 
         endpoint = self._get_server_endpoint(task["server_name"])
-        result = await self.mcp_executor.execute(endpoint=endpoint, payload=payload)
+        result = await self.mcp_executor.execute(
+            endpoint=endpoint, payload=payload, action=task.get("action", "process")
+        )
 
         if task.get("refine_llm"):
-            result = llm_refiner.post_process(
+            result = await llm_refiner.post_process(
                 str(result),
                 {"system": task.get("refine_instruction", "")}
             )
@@ -168,67 +259,74 @@ class OrchestratorService:
 
     def _get_server_endpoint(self, server_name: str) -> str:
         """Get the endpoint URL for a given server name."""
-        server = mcp_server_repo.get_mcp_server_by_name(self.db, server_name)
+        server = self.config.servers_by_name.get(server_name)
         if not server:
             raise MCPServerError(f"MCP Server '{server_name}' not found")
         return server.endpoint_url
 
     async def _prepare_mcp_server_info(self, mcp_servers) -> List[Dict[str, Any]]:
         """Prepare MCP server information including manifests."""
-        mcp_info = []
-        for server in mcp_servers:
-            manifest = await self._fetch_manifest(server.endpoint_url)
-            mcp_info.append({
+        manifests = await manifest_cache.get_many([server.endpoint_url for server in mcp_servers])
+        return [{
                 "server_name": server.name,
                 "keywords": server.keywords,
                 "endpoint": server.endpoint_url,
                 "manifest": manifest
-            })
-        return mcp_info
+            } for server, manifest in zip(mcp_servers, manifests)
+        ]
 
     def _get_llm_api(self):
         """Retrieve LLM API configuration."""
-        all_llms = llm_api_repo.get_all_llm_apis(self.db)
-        if not all_llms:
+        if not self.config.llm_apis:
             raise LLMError("No LLM APIs configured")
-        return all_llms[0]
+        return self.config.llm_apis[0]
 
     def _get_system_instruction(self) -> str:
-        """Read system instructions from configuration file."""
-        try:
-            with open("config/system_instruction.txt", "r", encoding="utf-8") as f:
-                return f.read()
-        except IOError as e:
-            raise OrchestratorServiceError(f"Failed to read system instructions: {str(e)}")
+        """System instructions from the configuration snapshot."""
+        if self.config.system_instruction is None:
+            raise OrchestratorServiceError("Failed to read system instructions")
+        return self.config.system_instruction
 
     async def _fetch_manifest(self, base_url: str) -> Dict[str, Any]:
-        """Fetch manifest from MCP server."""
-        try:
-            async with httpx.AsyncClient(timeout=self.MANIFEST_TIMEOUT) as client:
-                resp = await client.get(f"{base_url}/manifest.json")
-                resp.raise_for_status()
-                return resp.json()
-        except Exception as e:
-            logger.warning(f"Manifest fetch failed for {base_url}: {str(e)}")
-            return {}
+        """Fetch manifest from MCP server, served from the shared manifest cache."""
+        return await manifest_cache.get(base_url)
 
-    def _format_final_response(self, steps: List[ExecutionStep], 
+    async def _format_final_response(self, steps: List[ExecutionStep], 
                              llm_refiner: OpenAILLMRefiner) -> str:
         """Format the final response using the execution steps."""
         final_context = str(steps[-1].response)
         steps_json = json.dumps([step.__dict__ for step in steps], indent=2)
-        refined = llm_refiner.pick_prompt_context(
+        with observe(LLM_LATENCY, operation="summarize"):
+            refined = await llm_refiner.pick_prompt_context(
+                final_context,
+                f"Given the following steps:\n{steps_json}"
+            )
+        return self.response_formatter.format(refined, {})
+
+    def _template_final_response(self, plan_source: str, mcp_plan: List[Dict[str, Any]],
+                                 steps: List[ExecutionStep]) -> Optional[str]:
+        """Answer rule-planned prompts without the summarizing LLM call when the result is simple."""
+        if plan_source != "rule" or not self.template_summary:
+            return None
+        return self.rule_planner.summarize(mcp_plan, [step.response for step in steps])
+
+    async def _stream_final_response(self, steps: List[ExecutionStep],
+                                     llm_refiner: OpenAILLMRefiner) -> AsyncIterator[str]:
+        """Stream the final summary token by token; the caller assembles and formats it."""
+        final_context = str(steps[-1].response)
+        steps_json = json.dumps([step.__dict__ for step in steps], indent=2)
+        async for delta in llm_refiner.stream_prompt_context(
             final_context,
             f"Given the following steps:\n{steps_json}"
-        )
-        return self.response_formatter.format(refined, {})
+        ):
+            yield delta
 
-    def _save_chat_history(self, user_id: str, session_id: str, prompt_text: str,
-                          enriched_prompt: str, steps: List[ExecutionStep],
-                          mcp_plan: List[Dict[str, Any]], formatted_response: str):
+    async def _save_chat_history(self, user_id: str, session_id: str, prompt_text: str,
+                                 enriched_prompt: str, steps: List[ExecutionStep],
+                                 mcp_plan: List[Dict[str, Any]], formatted_response: str):
         """Save the chat interaction history."""
-        session_title = self._get_or_create_session_title(session_id, prompt_text)
-        chat_history_repo.create_chat_history(self.db, {
+        session_title = await self._get_or_create_session_title(session_id, prompt_text)
+        await chat_history_writer.save({
             "session_id": session_id,
             "session_title": session_title,
             "user_id": user_id,
@@ -240,46 +338,62 @@ class OrchestratorService:
             "requests": mcp_plan
         })
 
-    def _get_or_create_session_title(self, session_id: str, prompt_text: str) -> str:
+    async def _get_or_create_session_title(self, session_id: str, prompt_text: str) -> str:
         """Get existing session title or create a new one."""
-        existing = chat_history_repo.get_chat_history_by_session(self.db, session_id)
-        if existing and existing[0].session_title:
-            return existing[0].session_title
+        title = chat_history_writer.pending_title(session_id)
+        if title:
+            return title
+        existing, title = await async_chat_history_repo.get_session_title(self.db, session_id)
+        if title:
+            return title
         return (prompt_text[:self.MAX_TITLE_LENGTH] if existing 
                 else prompt_text[:self.SHORT_TITLE_LENGTH])
 
     def _create_final_payload(self, session_id: str, steps: List[ExecutionStep],
-                            formatted_response: str) -> Dict[str, Any]:
+                            formatted_response: str, plan_source: str) -> Dict[str, Any]:
         """Create the final response payload."""
         payload = {
             "session_id": session_id,
             "steps": [step.__dict__ for step in steps],
-            "final_answer": formatted_response
+            "final_answer": formatted_response,
+            "planner": plan_source
         }
         logger.debug(f"Final payload: {payload}")
         return payload
     
     async def _execute_single_task_with_context(self, task: Dict[str, Any], 
-                                             previous_steps: List[ExecutionStep],
-                                             llm_refiner: OpenAILLMRefiner) -> ExecutionStep:
-        """Execute a single task and return the execution step."""
+                                             dependency_steps: Dict[int, ExecutionStep],
+                                             llm_refiner: OpenAILLMRefiner) -> Tuple[ExecutionStep, Dict[str, float]]:
+        """
+        Execute a single task and return the execution step with its timings in
+        milliseconds. The results of the tasks listed in ``depends_on`` are passed
+        as ``previous_results``, keyed by task index; ``refine_previous`` passes
+        the latest one as ``previous_result``.
+        """
         payload = task["payload"].copy()
-        previous_results = [step.response for step in previous_steps]
-        
+        previous_results = {index: step.response for index, step in sorted(dependency_steps.items())}
+
+        if task.get("depends_on") is not None and previous_results:
+            payload["previous_results"] = {str(index): result for index, result in previous_results.items()}
         if task.get("refine_previous") and previous_results:
-            payload["previous_result"] = previous_results[-1]
+            payload["previous_result"] = previous_results[max(previous_results)]
 
         endpoint = self._get_server_endpoint(task["server_name"])
-        result = await self.mcp_executor.execute(endpoint=endpoint, payload=payload)
+        action = task.get("action", "process")
+        timings: Dict[str, float] = {}
+        with observe(MCP_LATENCY, timings, "mcp_ms", server=task["server_name"], action=action):
+            result = await self.mcp_executor.execute(endpoint=endpoint, payload=payload, action=action)
 
         if task.get("refine_llm"):
-            result = llm_refiner.post_process(
-                str(result),
-                {"system": task.get("refine_instruction", "")}
-            )
+            with observe(LLM_LATENCY, timings, "refine_llm_ms", operation="refine_result"):
+                result = await llm_refiner.post_process(
+                    str(result),
+                    {"system": task.get("refine_instruction", "")}
+                )
         
-        return ExecutionStep(
+        step = ExecutionStep(
             server_name=task["server_name"],
             request=task["payload"],
             response=result
-        )
\ No newline at end of file
+        )
+        return step, timings
\ No newline at end of file
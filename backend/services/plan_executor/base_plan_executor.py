@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+
+# Called with the task and the results of its dependencies, keyed by task index
+TaskRunner = Callable[[Dict[str, Any], Dict[int, Any]], Awaitable[Any]]
+
+
+class InvalidTaskError(ValueError):
+    """A task of the plan cannot run; the executor reports it for that task and continues."""
+
+
+class PlanExecutor(ABC):
+
+    @abstractmethod
+    def run(self, plan: List[Dict[str, Any]], run_task: TaskRunner) -> AsyncIterator[Tuple[str, int, Any]]:
+        pass
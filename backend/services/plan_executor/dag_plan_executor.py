@@ -0,0 +1,93 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from backend.services.plan_executor.base_plan_executor import InvalidTaskError, PlanExecutor, TaskRunner
+
+
+class DAGPlanExecutor(PlanExecutor):
+    """
+    Runs the tasks of a plan as a dependency graph.
+
+    A task depends on the tasks listed in its optional ``depends_on`` field
+    (zero-based indexes of earlier tasks) or, when it sets ``refine_previous``,
+    on the task right before it. Independent tasks run concurrently, bounded by
+    ``max_concurrency``, while events are always yielded in plan order.
+    """
+
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    @staticmethod
+    def build_dependencies(plan: List[Dict[str, Any]]) -> Tuple[List[List[int]], List[Optional[str]]]:
+        """
+        Return, for each task, the indexes of the earlier tasks it waits for and
+        an error message when its ``depends_on`` is invalid (else None).
+        """
+        dependencies, errors = [], []
+        for index, task in enumerate(plan):
+            explicit = task.get("depends_on")
+            error = None
+            if explicit is not None:
+                if not isinstance(explicit, list):
+                    explicit = [explicit]
+                deps = set()
+                for entry in explicit:
+                    position = entry
+                    if isinstance(entry, str) and entry.strip().isdigit():
+                        position = int(entry)
+                    # Only earlier tasks are accepted, which keeps the graph acyclic
+                    if isinstance(position, int) and not isinstance(position, bool) and 0 <= position < index:
+                        deps.add(position)
+                    else:
+                        error = f"Invalid depends_on entry {entry!r}: expected the index of an earlier task"
+                deps = sorted(deps)
+            elif task.get("refine_previous") and index > 0:
+                deps = [index - 1]
+            else:
+                deps = []
+            dependencies.append(deps)
+            errors.append(error)
+        return dependencies, errors
+
+    async def run(self, plan: List[Dict[str, Any]], run_task: TaskRunner) -> AsyncIterator[Tuple[str, int, Any]]:
+        """
+        Execute the plan and yield ``("task_start", index, task)`` followed by
+        ``("task_complete", index, result)`` for every task, in plan order.
+        ``run_task`` receives the task and the results of its dependencies by index.
+        A task that cannot run (invalid ``depends_on``, or a dependency that could
+        not run) yields ``("task_error", index, message)`` instead; the rest of the
+        plan is unaffected.
+        """
+        dependencies, errors = self.build_dependencies(plan)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending: List[asyncio.Task] = []
+
+        async def run_one(index: int) -> Any:
+            if errors[index]:
+                raise InvalidTaskError(errors[index])
+            dep_results = {}
+            for d in dependencies[index]:
+                try:
+                    dep_results[d] = await pending[d]
+                except InvalidTaskError:
+                    raise InvalidTaskError(f"Task {d}, which this task depends on, could not run")
+            async with semaphore:
+                return await run_task(plan[index], dep_results)
+
+        for index in range(len(plan)):
+            pending.append(asyncio.create_task(run_one(index)))
+
+        try:
+            for index, future in enumerate(pending):
+                yield "task_start", index, plan[index]
+                try:
+                    result = await future
+                except InvalidTaskError as e:
+                    yield "task_error", index, str(e)
+                else:
+                    yield "task_complete", index, result
+        finally:
+            for future in pending:
+                if not future.done():
+                    future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class Planner(ABC):
+
+    @abstractmethod
+    def plan(self, prompt: str, mcp_info: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Return an execution plan, or None when the planner is not confident."""
+        pass
@@ -0,0 +1,209 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.core.plan_cache import PlanCache
+from backend.services.planner.base_planner import Planner
+
+
+# Extra phrasings for common enum values; every enum value also matches itself
+SYNONYMS = {
+    "add": {"add", "plus", "sum", "total", "addition", "+"},
+    "subtract": {"subtract", "minus", "difference", "subtraction", "-"},
+    "multiply": {"multiply", "times", "product", "multiplied", "multiplication", "*", "×"},
+    "divide": {"divide", "divided", "quotient", "division", "/", "÷"},
+}
+
+# Filler words that never change the meaning of a single-operation request
+STOPWORDS = {
+    "what", "whats", "is", "the", "of", "a", "an", "and", "with", "by", "please", "calculate",
+    "compute", "find", "get", "me", "tell", "give", "result", "value", "to", "for", "i", "want",
+    "need", "can", "you", "how", "much", "equals", "equal", "=", "its", "it", "are", "do",
+}
+
+# Words that ask for something a single enum operation cannot express
+UNSUPPORTED_WORDS = {
+    "power", "root", "squared", "cubed", "percent", "percentage", "average", "mean", "median",
+    "mode", "factorial", "absolute", "floor", "ceiling", "round", "rounding", "prime", "modulus",
+    "mod", "exponent", "exponentiation", "log", "sqrt", "then", "from", "into", "each", "all",
+}
+
+# Words naming the measurement behind generic numeric fields such as "dimension1"
+DIMENSION_WORDS = {
+    "radius", "side", "sides", "length", "width", "breadth", "height", "base", "edge", "dimension",
+    "dimensions", "size",
+}
+
+# Quantities a dimension-based action measures; its prompt has to name one ("area of a square
+# with side 4"), so "square of 4" is not read as an area
+MEASUREMENT_WORDS = {"area", "perimeter", "circumference", "volume"}
+
+# Verbs that put their operands in reverse order: "subtract 3 from 5" means 5 - 3
+REVERSED_OPERANDS = {"subtract": ("subtract", "from")}  # verb -> (enum value, connective)
+
+# A minus sign directly in front of a number (and not after a word or number) makes it negative
+NUMBER_PATTERN = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?")
+TOKEN_PATTERN = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?|\d+(?:\.\d+)?|[a-z]+|[+\-*/×÷=]")
+
+
+@dataclass
+class ActionRule:
+    server_name: str
+    action: str
+    selector_field: str
+    numeric_fields: List[str]
+    required_numeric: int
+    triggers: Dict[str, str]  # word -> enum value
+    vocabulary: Set[str] = field(default_factory=set)
+    measurements: Set[str] = field(default_factory=set)  # prompt must contain one of these, when set
+
+
+class RuleBasedPlanner(Planner):
+    """
+    Deterministic planner for single-operation prompts such as "sum of 5 and 8"
+    or "area of a circle with radius 3".
+
+    Rules are compiled from each manifest action whose ``input_model`` has exactly
+    one enum field plus numeric fields. A plan is produced only when exactly one
+    enum value matches, the number count fits the schema, and every other word
+    of the prompt is explained by the schema, the server keywords or filler words.
+    Actions over dimension fields also need the measurement named ("area of ..."),
+    and "subtract X from Y" is planned as Y - X. Otherwise ``plan`` returns None
+    and the caller falls back to the LLM.
+    """
+
+    def __init__(self):
+        self._compiled_for: Optional[str] = None
+        self._rules: List[ActionRule] = []
+
+    def plan(self, prompt: str, mcp_info: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        rules = self._rules_for(mcp_info)
+        tokens = TOKEN_PATTERN.findall(prompt.lower())
+        reversed_value, connective = self._reversed_form(tokens)
+        words = [t for i, t in enumerate(tokens) if not NUMBER_PATTERN.fullmatch(t) and i != connective]
+        if not words or any(word in UNSUPPORTED_WORDS for word in words):
+            return None
+
+        matches: List[Tuple[ActionRule, str]] = []
+        for rule in rules:
+            values = {rule.triggers[word] for word in words if word in rule.triggers}
+            for value in values:
+                matches.append((rule, value))
+        if len(matches) != 1:
+            return None
+
+        rule, value = matches[0]
+        if any(word not in rule.vocabulary for word in words):
+            return None
+        if rule.measurements and not rule.measurements.intersection(words):
+            return None
+
+        numbers = [float(n) for n in NUMBER_PATTERN.findall(prompt)]
+        if not rule.required_numeric <= len(numbers) <= len(rule.numeric_fields):
+            return None
+        if reversed_value is not None:
+            if value != reversed_value or len(numbers) != 2:
+                return None
+            numbers.reverse()
+
+        payload: Dict[str, Any] = {rule.selector_field: value}
+        for name, number in zip(rule.numeric_fields, numbers):
+            payload[name] = int(number) if number.is_integer() else number
+
+        task: Dict[str, Any] = {"server_name": rule.server_name, "payload": payload}
+        if rule.action != "process":
+            task["action"] = rule.action
+        return [task]
+
+    def summarize(self, plan: List[Dict[str, Any]], results: List[Any]) -> Optional[str]:
+        """Describe the result of a single-step rule plan without an LLM, when it is a plain number."""
+        if len(plan) != 1 or len(results) != 1 or not isinstance(results[0], dict):
+            return None
+        numeric = {k: v for k, v in results[0].items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        if len(numeric) != 1 or "error" in results[0]:
+            return None
+        key, value = next(iter(numeric.items()))
+        payload = dict(plan[0]["payload"])
+        selector = next((v for v in payload.values() if isinstance(v, str)), "")
+        arguments = ", ".join(f"{k}={v}" for k, v in payload.items() if not isinstance(v, str))
+        return f"The {key} for {selector} with {arguments} is {value:.10g}."
+
+    @staticmethod
+    def _reversed_form(tokens: List[str]) -> Tuple[Optional[str], Optional[int]]:
+        """Find "<verb> <number> <connective> <number>"; returns the verb's enum value and the connective's index."""
+        for i in range(len(tokens) - 3):
+            verb, first, connective, second = tokens[i:i + 4]
+            value, expected = REVERSED_OPERANDS.get(verb, (None, None))
+            if (connective == expected and NUMBER_PATTERN.fullmatch(first)
+                    and NUMBER_PATTERN.fullmatch(second)):
+                return value, i + 2
+        return None, None
+
+    def _rules_for(self, mcp_info: List[Dict[str, Any]]) -> List[ActionRule]:
+        """Compile rules once per distinct set of manifests."""
+        manifests_hash = PlanCache.hash_manifests(mcp_info)
+        if manifests_hash != self._compiled_for:
+            self._rules = [rule for server in mcp_info for rule in self._compile_server(server)]
+            self._compiled_for = manifests_hash
+        return self._rules
+
+    @classmethod
+    def _compile_server(cls, server: Dict[str, Any]) -> List[ActionRule]:
+        manifest = server.get("manifest") or {}
+        keywords = set(TOKEN_PATTERN.findall((server.get("keywords") or "").lower()))
+        server_words = set(TOKEN_PATTERN.findall(f"{server.get('server_name') or ''} {manifest.get('name') or ''}".lower()))
+        rules = []
+        for action in manifest.get("actions") or []:
+            schema = action.get("input_model") or {}
+            properties = schema.get("properties") or {}
+            required = set(schema.get("required") or [])
+            enum_fields = [name for name, prop in properties.items() if cls._enum_values(prop)]
+            numeric_fields = [name for name, prop in properties.items() if cls._field_type(prop) in ("number", "integer")]
+            others = required - set(enum_fields) - set(numeric_fields)
+            if len(enum_fields) != 1 or not numeric_fields or others:
+                continue
+
+            triggers: Dict[str, str] = {}
+            for value in cls._enum_values(properties[enum_fields[0]]):
+                for word in SYNONYMS.get(value, set()) | {value, f"{value}s"}:
+                    triggers[word] = value
+
+            description_words = set(TOKEN_PATTERN.findall(str(action.get("description") or "").lower()))
+            vocabulary = set(STOPWORDS) | set(triggers) | keywords | server_words | description_words
+            measurements: Set[str] = set()
+            for name, prop in properties.items():
+                field_text = f"{name} {prop.get('title') or ''} {prop.get('description') or ''}".lower()
+                vocabulary |= set(TOKEN_PATTERN.findall(field_text))
+                if name in numeric_fields and "dimension" in field_text:
+                    vocabulary |= DIMENSION_WORDS
+                    measurements = MEASUREMENT_WORDS & (description_words | server_words)
+
+            rules.append(ActionRule(
+                server_name=server.get("server_name"),
+                action=action.get("name") or "process",
+                selector_field=enum_fields[0],
+                numeric_fields=numeric_fields,
+                required_numeric=len([name for name in numeric_fields if name in required]),
+                triggers=triggers,
+                vocabulary=vocabulary,
+                measurements=measurements,
+            ))
+        return rules
+
+    @staticmethod
+    def _enum_values(prop: Dict[str, Any]) -> List[str]:
+        if prop.get("enum"):
+            return [str(v) for v in prop["enum"]]
+        for option in prop.get("anyOf") or []:
+            if option.get("enum"):
+                return [str(v) for v in option["enum"]]
+        return []
+
+    @staticmethod
+    def _field_type(prop: Dict[str, Any]) -> Optional[str]:
+        if prop.get("type"):
+            return prop["type"]
+        for option in prop.get("anyOf") or []:
+            if option.get("type") and option["type"] != "null":
+                return option["type"]
+        return None
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from backend.config.settings import settings
+from backend.database.archive import (
+    ARCHIVE_DIR, CHAT_HISTORY_COLUMNS, archive_file_for, archive_path, prepare_archive
+)
+from backend.database.connection import session_scope
+from backend.database.init_db import apply_sqlite_pragmas
+from backend.database.repository import archive_index_repo
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionService:
+    """
+    Moves sessions idle for longer than ``max_age_days`` from ``chat_history``
+    into monthly archive files, records them in ``archive_index`` and returns the
+    freed pages with an incremental vacuum.
+    """
+
+    def __init__(self, enabled: bool = False, max_age_days: int = 180, interval_seconds: float = 3600,
+                 batch_size: int = 500, vacuum_pages: int = 2000):
+        self.enabled = enabled
+        self.max_age_days = max_age_days
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.db_path = settings.database_url.replace("sqlite:///", "")
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    async def run_periodically(self):
+        """Background loop started by the application lifespan; the first sweep waits one interval."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Chat history retention run failed")
+
+    def run_once(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat()
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            apply_sqlite_pragmas(conn)
+            # Oldest first, so a run cut short by batch_size leaves only newer sessions behind
+            sessions = conn.execute(
+                "SELECT session_id, max(created_at) AS last_activity FROM chat_history "
+                "GROUP BY session_id HAVING max(created_at) < ? "
+                "ORDER BY max(created_at), session_id LIMIT ?",
+                (cutoff, self.batch_size),
+            ).fetchall()
+
+            partitions: Dict[str, List[str]] = defaultdict(list)
+            for session_id, last_activity in sessions:
+                existing = conn.execute(
+                    "SELECT archive_file FROM archive_index WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                # A session that was archived before keeps using the same file
+                partitions[existing[0] if existing else archive_file_for(last_activity)].append(session_id)
+
+            moved_messages = 0
+            for archive_file, session_ids in partitions.items():
+                moved_messages += self._archive_sessions(conn, archive_file, session_ids)
+
+            conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall()
+        finally:
+            conn.close()
+
+        self.last_run = {
+            "finished_at": datetime.now().isoformat(),
+            "cutoff": cutoff,
+            "archived_sessions": len(sessions),
+            "archived_messages": moved_messages,
+            "archive_files": sorted(partitions),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if sessions:
+            logger.info("Archived %d sessions (%d messages)", len(sessions), moved_messages)
+        return self.last_run
+
+    def _archive_sessions(self, conn: sqlite3.Connection, archive_file: str, session_ids: List[str]) -> int:
+        """
+        Copy the sessions into the archive, then index and delete them from the hot
+        table. The two steps commit separately (WAL makes transactions across attached
+        databases non-atomic); the copy is idempotent, so an interrupted run only
+        leaves rows to be moved again. Only rows present in the archive are deleted,
+        so a message written to a session between the two commits stays hot.
+        """
+        placeholders = ", ".join("?" for _ in session_ids)
+        conn.execute("ATTACH DATABASE ? AS archive", (str(archive_path(archive_file)),))
+        try:
+            prepare_archive(conn, "archive")
+            conn.execute("BEGIN")
+            conn.execute(
+                f"INSERT OR IGNORE INTO archive.chat_history ({CHAT_HISTORY_COLUMNS}) "
+                f"SELECT {CHAT_HISTORY_COLUMNS} FROM main.chat_history WHERE session_id IN ({placeholders})",
+                session_ids,
+            )
+            conn.execute("COMMIT")
+
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO main.archive_index "
+                "(session_id, archive_file, session_title, last_activity, message_count, archived_at) "
+                "SELECT session_id, ?, max(session_title), max(created_at), count(*), ? "
+                f"FROM archive.chat_history WHERE session_id IN ({placeholders}) GROUP BY session_id "
+                "ON CONFLICT(session_id) DO UPDATE SET "
+                "last_activity = excluded.last_activity, "
+                "message_count = excluded.message_count, "
+                "archived_at = excluded.archived_at",
+                [archive_file, datetime.now().isoformat(), *session_ids],
+            )
+            moved = conn.execute(
+                "DELETE FROM main.chat_history WHERE id IN "
+                f"(SELECT id FROM archive.chat_history WHERE session_id IN ({placeholders}))",
+                session_ids,
+            ).rowcount
+            conn.execute("COMMIT")
+            return moved
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute("DETACH DATABASE archive")
+
+    def status(self) -> Dict[str, Any]:
+        with session_scope() as db:
+            archived_sessions = archive_index_repo.count_archived_sessions(db)
+        return {
+            "enabled": self.enabled,
+            "max_age_days": self.max_age_days,
+            "archived_sessions": archived_sessions,
+            "archive_files": sorted(path.name for path in ARCHIVE_DIR.glob("chat_history_*.db")),
+            "last_run": self.last_run,
+        }
+
+
+retention_service = RetentionService(
+    enabled=settings.retention.get("enabled", False),
+    max_age_days=settings.retention.get("max_age_days", 180),
+    interval_seconds=settings.retention.get("interval_seconds", 3600),
+    batch_size=settings.retention.get("batch_size", 500),
+    vacuum_pages=settings.retention.get("vacuum_pages", 2000),
+)
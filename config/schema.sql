@@ -34,6 +34,15 @@ CREATE TABLE IF NOT EXISTS mcp_servers (
     is_active BOOLEAN DEFAULT 1
 );
 
+-- Additional endpoints serving the same MCP server; calls are balanced across them and endpoint_url
+CREATE TABLE IF NOT EXISTS mcp_server_replicas (
+    id TEXT PRIMARY KEY,
+    server_id TEXT NOT NULL REFERENCES mcp_servers(id) ON DELETE CASCADE,
+    endpoint_url TEXT NOT NULL,
+    is_active BOOLEAN DEFAULT 1,
+    UNIQUE (server_id, endpoint_url)
+);
+
 -- Chat History
 CREATE TABLE IF NOT EXISTS chat_history (
     id TEXT PRIMARY KEY,
@@ -48,3 +57,87 @@ CREATE TABLE IF NOT EXISTS chat_history (
     requests TEXT,
     created_at TEXT DEFAULT CURRENT_TIMESTAMP
 );
+
+-- Covers per-session loads and the retention job's GROUP BY session_id
+CREATE INDEX IF NOT EXISTS idx_chat_history_session_created
+    ON chat_history(session_id, created_at, session_title);
+CREATE INDEX IF NOT EXISTS idx_chat_history_created_at ON chat_history(created_at);
+
+-- One row per session in chat_history, kept current by the triggers below; the session list pages this table
+CREATE TABLE IF NOT EXISTS chat_sessions (
+    session_id TEXT PRIMARY KEY,
+    session_title TEXT,
+    last_activity TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_last_activity ON chat_sessions(last_activity, session_id);
+
+CREATE TRIGGER IF NOT EXISTS chat_sessions_insert AFTER INSERT ON chat_history BEGIN
+    INSERT INTO chat_sessions(session_id, session_title, last_activity)
+    VALUES (new.session_id, new.session_title, coalesce(new.created_at, CURRENT_TIMESTAMP))
+    ON CONFLICT(session_id) DO UPDATE SET
+        session_title = coalesce(chat_sessions.session_title, excluded.session_title),
+        last_activity = max(chat_sessions.last_activity, excluded.last_activity);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_sessions_title AFTER UPDATE OF session_title ON chat_history
+WHEN new.session_title IS NOT NULL BEGIN
+    UPDATE chat_sessions SET session_title = new.session_title WHERE session_id = new.session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_sessions_delete AFTER DELETE ON chat_history BEGIN
+    DELETE FROM chat_sessions WHERE session_id = old.session_id
+        AND NOT EXISTS (SELECT 1 FROM chat_history WHERE session_id = old.session_id);
+    UPDATE chat_sessions
+        SET last_activity = coalesce(
+            (SELECT max(created_at) FROM chat_history WHERE session_id = old.session_id), last_activity)
+        WHERE session_id = old.session_id AND last_activity = old.created_at;
+END;
+
+-- Full-text index over chat history (external content: the text lives in chat_history only)
+CREATE VIRTUAL TABLE IF NOT EXISTS chat_history_fts USING fts5(
+    original_prompt,
+    final_response,
+    session_title,
+    content='chat_history',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS chat_history_fts_insert AFTER INSERT ON chat_history BEGIN
+    INSERT INTO chat_history_fts(rowid, original_prompt, final_response, session_title)
+    VALUES (new.rowid, new.original_prompt, new.final_response, new.session_title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_history_fts_delete AFTER DELETE ON chat_history BEGIN
+    INSERT INTO chat_history_fts(chat_history_fts, rowid, original_prompt, final_response, session_title)
+    VALUES ('delete', old.rowid, old.original_prompt, old.final_response, old.session_title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chat_history_fts_update AFTER UPDATE OF original_prompt, final_response, session_title
+ON chat_history BEGIN
+    INSERT INTO chat_history_fts(chat_history_fts, rowid, original_prompt, final_response, session_title)
+    VALUES ('delete', old.rowid, old.original_prompt, old.final_response, old.session_title);
+    INSERT INTO chat_history_fts(rowid, original_prompt, final_response, session_title)
+    VALUES (new.rowid, new.original_prompt, new.final_response, new.session_title);
+END;
+
+-- Plan Cache (LLM-generated execution plans)
+CREATE TABLE IF NOT EXISTS plan_cache (
+    cache_key TEXT PRIMARY KEY,
+    normalized_prompt TEXT NOT NULL,
+    manifests_hash TEXT NOT NULL,
+    instruction_hash TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Sessions moved out of chat_history by the retention job, and the archive file holding them
+CREATE TABLE IF NOT EXISTS archive_index (
+    session_id TEXT PRIMARY KEY,
+    archive_file TEXT NOT NULL,
+    session_title TEXT,
+    last_activity TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    archived_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archive_index_last_activity ON archive_index(last_activity, session_id);
@@ -11,37 +11,86 @@ st.set_page_config(page_title="💬 MCP Host", layout="wide")
 
 # --- Backend Base URL ---
 BACKEND_URL = "http://localhost:8000/api/chat"
+HISTORY_PAGE_SIZE = 50
+SEARCH_PAGE_SIZE = 20
+SESSION_PAGE_SIZE = 50
 
 # --- Session State Initialization ---
 if "selected_session_id" not in st.session_state:
     st.session_state.selected_session_id = None
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
+if "history_cursor" not in st.session_state:
+    st.session_state.history_cursor = None
+if "expanded_steps" not in st.session_state:
+    st.session_state.expanded_steps = {}
+if "session_pages" not in st.session_state:
+    st.session_state.session_pages = 1
 
 # --- Helper functions ---
-def fetch_sessions():
+def fetch_sessions(before=None):
+    """Fetch one page of sessions, most recently active first, after the ``before`` cursor."""
     try:
-        res = requests.get(f"{BACKEND_URL}/all")
+        params = {"limit": SESSION_PAGE_SIZE}
+        if before:
+            params["before"] = before
+        res = requests.get(f"{BACKEND_URL}/all", params=params)
         if res.status_code == 200:
             return res.json()
     except Exception:
         return []
     return []
 
-def fetch_chat_history(session_id):
+def fetch_session_pages(pages):
+    """The first ``pages`` pages of sessions; also says whether more may follow."""
+    sessions, page = [], fetch_sessions()
+    sessions += page
+    while len(page) == SESSION_PAGE_SIZE and len(sessions) < pages * SESSION_PAGE_SIZE:
+        page = fetch_sessions(sessions[-1]["cursor"])
+        sessions += page
+    return sessions, len(page) == SESSION_PAGE_SIZE
+
+def fetch_chat_history(session_id, before=None):
+    """Fetch one page of messages; returns (messages, cursor of the oldest one or None when exhausted)."""
     try:
-        res = requests.get(f"{BACKEND_URL}/{session_id}")
+        params = {"limit": HISTORY_PAGE_SIZE}
+        if before:
+            params["before"] = before
+        res = requests.get(f"{BACKEND_URL}/{session_id}", params=params)
         if res.status_code == 200:
             chats = res.json()
-            print(">> chats:", chats)
-            return [(chat["user_prompt"], chat["steps"], chat["final_answer"]) for chat in chats]
+            cursor = chats[0]["cursor"] if len(chats) == HISTORY_PAGE_SIZE else None
+            return [(chat["user_prompt"], chat["steps"], chat["final_answer"], chat["id"]) for chat in chats], cursor
+    except Exception:
+        return [], None
+    return [], None
+
+def fetch_message_steps(message_id):
+    """Steps are not part of history pages; they are fetched when the user expands a message."""
+    try:
+        res = requests.get(f"{BACKEND_URL}/messages/{message_id}/steps",
+                           params={"session_id": st.session_state.selected_session_id})
+        if res.status_code == 200:
+            return res.json()["steps"]
     except Exception:
         return []
     return []
 
-def switch_session(sess_id):
+def search_chats(query):
+    try:
+        res = requests.get(f"{BACKEND_URL}/search", params={"q": query, "limit": SEARCH_PAGE_SIZE})
+        if res.status_code == 200:
+            return res.json()
+    except Exception:
+        return []
+    return []
+
+def load_session(sess_id):
     st.session_state.selected_session_id = sess_id
-    st.session_state.chat_history = fetch_chat_history(sess_id)
+    st.session_state.chat_history, st.session_state.history_cursor = fetch_chat_history(sess_id)
+
+def switch_session(sess_id):
+    load_session(sess_id)
     print(">> switch_session - session_id:", st.session_state.selected_session_id)
     st.rerun()
 
@@ -55,21 +104,38 @@ with st.sidebar:
     st.write("---")
 
     st.title("🕑 History")
-    sessions = fetch_sessions()
+    search_query = st.text_input("🔎 Search chats", placeholder="Search prompts and answers")
+    if search_query.strip():
+        matches = search_chats(search_query)
+        if not matches:
+            st.caption("No matching messages.")
+        for idx, match in enumerate(matches):
+            if st.button(match["session_title"][:25], key=f"search_{match['message_id']}_{idx}",
+                         use_container_width=True):
+                load_session(match["session_id"])
+                st.rerun()
+            st.caption(match["prompt_snippet"] or match["answer_snippet"])
+        st.write("---")
+
+    sessions, more_sessions = fetch_session_pages(st.session_state.session_pages)
 
     if st.button("➕ New Chat", use_container_width=True):
         st.session_state.selected_session_id = str(uuid.uuid4())
         st.session_state.chat_history = []
+        st.session_state.history_cursor = None
         st.rerun()
 
     for idx, session in enumerate(sessions):
         label = session["session_title"][:22] + "..." if len(session["session_title"]) > 25 else session["session_title"]
         unique_key = f"{session['session_id']}_{idx}"  # Ensure the key is unique
         if st.button(label, key=unique_key, use_container_width=True):
-            st.session_state.selected_session_id = session["session_id"]
-            st.session_state.chat_history = fetch_chat_history(session["session_id"])
+            load_session(session["session_id"])
             st.rerun()
 
+    if more_sessions and st.button("⬇️ Load more sessions", use_container_width=True):
+        st.session_state.session_pages += 1
+        st.rerun()
+
 
 # --- Main Area ---
 st.markdown("### 💬 MCP Calculator")
@@ -96,10 +162,15 @@ if prompt:
             steps_collected = []
             requests_collected = []
             final_answer = ""
+            streamed_answer = ""
+            answer_box = st.empty()
 
             for event in client.events():
                 if event.event == "status":
                     progress_box.info(event.data)
+                elif event.event == "answer_delta":
+                    streamed_answer += json.loads(event.data).get("delta", "")
+                    answer_box.markdown(f"💬 {streamed_answer}")
                 elif event.event == "error":
                     progress_box.error(event.data)
                 elif event.event == "result":
@@ -111,15 +182,26 @@ if prompt:
             st.error(f"Failed: {str(e)}")
 
     # Save the new chat step into history
-    st.session_state.chat_history.append((prompt, steps_collected, final_answer))
+    st.session_state.chat_history.append((prompt, steps_collected, final_answer, None))
     st.rerun()
 
 
 # --- Display Chat History ---
-for idx, (prompt_text, steps, final_answer) in enumerate(st.session_state.chat_history):
+if st.session_state.history_cursor and st.button("⬆️ Load earlier messages"):
+    older, st.session_state.history_cursor = fetch_chat_history(
+        st.session_state.selected_session_id, st.session_state.history_cursor
+    )
+    st.session_state.chat_history = older + st.session_state.chat_history
+    st.rerun()
+
+for idx, (prompt_text, steps, final_answer, message_id) in enumerate(st.session_state.chat_history):
     with st.container(border=True):
         st.chat_message("user").write(prompt_text)
         with st.chat_message("assistant"):
+            if steps is None:
+                steps = st.session_state.expanded_steps.get(message_id)
+                if steps is None and st.button("🔍 Show steps", key=f"steps_{message_id}"):
+                    steps = st.session_state.expanded_steps[message_id] = fetch_message_steps(message_id)
             if steps:
                 st.markdown("**Assistant Response:**")
                 for step_idx, step in enumerate(steps, start=1):
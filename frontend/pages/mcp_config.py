@@ -11,6 +11,11 @@ def set_success_and_rerun(flag_name: str):
     st.session_state[flag_name] = True
     st.rerun()
 
+def parse_replicas(text: str) -> list:
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+HEALTH_ICONS = {"healthy": "🟢", "unhealthy": "🔴", "ejected": "🟠", "unknown": "⚪"}
+
 st.set_page_config(page_title="🖥️ MCP Server Management", layout="wide")
 
 BACKEND_URL = "http://localhost:8000/api"
@@ -45,6 +50,7 @@ st.markdown("##### ➕ Add / Update MCP Server")
 mcp_name = st.text_input("MCP Server Name")
 mcp_keywords = st.text_input("Keywords (comma-separated)")
 mcp_endpoint_url = st.text_input("Endpoint URL", placeholder="http://localhost:9001/process")
+mcp_replicas = st.text_area("Replica URLs (one per line, optional)", placeholder="http://localhost:9002")
 
 
 if st.button("Save MCP Server"):
@@ -52,7 +58,8 @@ if st.button("Save MCP Server"):
         payload = {
             "name": mcp_name,
             "keywords": mcp_keywords,
-            "endpoint_url": mcp_endpoint_url
+            "endpoint_url": mcp_endpoint_url,
+            "replicas": parse_replicas(mcp_replicas)
         }
         res = requests.post(f"{BACKEND_URL}/config/mcp_servers", json=payload)
         if res.status_code == 200:
@@ -73,6 +80,14 @@ else:
             current_name = st.text_input("Server Name", value=mcp['name'], key=f"name_{mcp['id']}")
             current_keywords = st.text_input("Keywords", value=mcp.get('keywords') or '', key=f"kw_{mcp['id']}")
             current_url = st.text_input("Endpoint URL", value=mcp['endpoint_url'], key=f"url_{mcp['id']}")
+            current_replicas = st.text_area("Replica URLs", value="\n".join(mcp.get('replicas') or []),
+                                            key=f"replicas_{mcp['id']}")
+
+            for replica in mcp.get('health') or []:
+                icon = HEALTH_ICONS.get(replica['status'], "⚪")
+                latency = f", {replica['ewma_ms']} ms" if replica.get('ewma_ms') is not None else ""
+                st.caption(f"{icon} {replica['endpoint_url']} — {replica['status']} "
+                           f"({replica['outstanding']} in flight{latency})")
 
             col1, col2 = st.columns(2)
 
@@ -82,7 +97,8 @@ else:
                         "id": mcp['id'],
                         "name": current_name,
                         "keywords": current_keywords,
-                        "endpoint_url": current_url
+                        "endpoint_url": current_url,
+                        "replicas": parse_replicas(current_replicas)
                     }
                     res = requests.post(f"{BACKEND_URL}/config/mcp_servers", json=payload)
                     if res.status_code == 200:
@@ -1,9 +1,14 @@
 # file: mcp_area_calculator.py
 
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Literal
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Literal, Optional, Union
 import math
+import numpy as np
+import hashlib
+import json
+import sys
 import uvicorn
 
 app = FastAPI(title="Area Calculator MCP Server")
@@ -13,19 +18,66 @@ class AreaRequest(BaseModel):
     dimension1: float
     dimension2: float = None
 
+class BatchRequest(BaseModel):
+    items: List[Dict[str, Any]]
+
+class RangeSpec(BaseModel):
+    start: float
+    stop: float  # inclusive
+    step: float = 1.0
+
+class ArrayRequest(BaseModel):
+    # Shapes are plain strings so an unknown one only fails its own element
+    shape: Union[str, List[str]]
+    dimension1: Union[float, List[Optional[float]], RangeSpec]
+    dimension2: Union[float, List[Optional[float]], RangeSpec, None] = None
+
+SHAPES = ("square", "rectangle", "triangle", "cube", "circle", "sphere")
+MAX_ARRAY_SIZE = 100_000
+
+MANIFEST = {
+    "name": "Area Calculator MCP Server",
+    "version": "1.0",
+    "actions": [
+        {
+            "name": "process",
+            "description": "Calculate area of different shapes",
+            "deterministic": True,
+            "cache_ttl": 3600,
+            "input_model": AreaRequest.schema()
+        },
+        {
+            "name": "process_batch",
+            "description": "Calculate the areas of several shapes in one call",
+            "batch_for": "process",
+            "max_batch_size": 100,
+            "input_model": BatchRequest.schema()
+        },
+        {
+            "name": "process_array",
+            "description": (
+                "Calculate many areas in one call. shape, dimension1 and dimension2 each take a single value "
+                "(applied to every element), a list (one value per element) or a range "
+                "{start, stop, step} with an inclusive stop, e.g. circles with radii 1 to 1000. "
+                f"Shapes: {', '.join(SHAPES)}. Returns an 'area' list plus an 'error_mask' list; "
+                "failed elements have area null and are explained in 'errors'."
+            ),
+            "deterministic": True,
+            "cache_ttl": 3600,
+            "max_array_size": MAX_ARRAY_SIZE,
+            "input_model": ArrayRequest.schema()
+        }
+    ]
+}
+MANIFEST_ETAG = '"' + hashlib.sha256(json.dumps(MANIFEST, sort_keys=True).encode()).hexdigest()[:16] + '"'
+
 @app.get("/manifest.json")
-async def manifest():
-    return {
-        "name": "Area Calculator MCP Server",
-        "version": "1.0",
-        "actions": [
-            {
-                "name": "process",
-                "description": "Calculate area of different shapes",
-                "input_model": AreaRequest.schema()
-            }
-        ]
-    }
+async def manifest(request: Request):
+    # Let clients revalidate with If-None-Match instead of re-downloading
+    if_none_match = request.headers.get("if-none-match", "")
+    if MANIFEST_ETAG in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": MANIFEST_ETAG})
+    return JSONResponse(MANIFEST, headers={"ETag": MANIFEST_ETAG})
 
 @app.post("/process")
 async def process_area(req: AreaRequest):
@@ -47,6 +99,86 @@ async def process_area(req: AreaRequest):
         return {"area": 4 * math.pi * (req.dimension1 ** 2)}
     return {"error": "Invalid shape"}
 
+@app.post("/process_batch")
+async def process_area_batch(req: BatchRequest):
+    # Items are validated one by one so a bad item only fails its own slot
+    results = []
+    for item in req.items:
+        try:
+            results.append(await process_area(AreaRequest(**item)))
+        except ValidationError as e:
+            results.append({"error": str(e)})
+    return {"results": results}
+
+def _column(value, name: str) -> np.ndarray:
+    """A request field as a float array; missing values become NaN."""
+    if value is None:
+        return np.array([np.nan])
+    if isinstance(value, RangeSpec):
+        if value.step <= 0:
+            raise ValueError(f"{name}.step must be positive")
+        count = math.floor((value.stop - value.start) / value.step + 1e-9) + 1
+        if count > MAX_ARRAY_SIZE:
+            raise ValueError(f"{name} range has more than {MAX_ARRAY_SIZE} values")
+        return value.start + value.step * np.arange(max(count, 0))
+    if isinstance(value, list):
+        return np.array([np.nan if v is None else v for v in value], dtype=float)
+    return np.array([value], dtype=float)
+
+@app.post("/process_array")
+async def process_area_array(req: ArrayRequest):
+    try:
+        shapes = np.array(req.shape if isinstance(req.shape, list) else [req.shape], dtype=object)
+        d1 = _column(req.dimension1, "dimension1")
+        d2 = _column(req.dimension2, "dimension2")
+    except ValueError as e:
+        return {"error": str(e)}
+
+    lengths = {len(column) for column in (shapes, d1, d2) if len(column) != 1}
+    if len(lengths) > 1:
+        return {"error": f"Columns must have the same length or a single value, got lengths {sorted(lengths)}"}
+    size = lengths.pop() if lengths else 1
+    if size > MAX_ARRAY_SIZE:
+        return {"error": f"At most {MAX_ARRAY_SIZE} elements per call"}
+    shapes, d1, d2 = (np.broadcast_to(column, size) for column in (shapes, d1, d2))
+
+    # One vectorized pass per formula; np.select keeps the one matching each element's shape
+    with np.errstate(over="ignore", invalid="ignore"):
+        area = np.select(
+            [shapes == shape for shape in SHAPES],
+            [d1 ** 2, d1 * d2, 0.5 * d1 * d2, 6 * d1 ** 2, np.pi * d1 ** 2, 4 * np.pi * d1 ** 2],
+            default=np.nan,
+        )
+
+    # Checked in order, so each failed element reports its first problem
+    invalid_shape = ~np.isin(shapes, SHAPES)
+    missing_d1 = np.isnan(d1)
+    missing_d2 = np.isin(shapes, ("rectangle", "triangle")) & np.isnan(d2)
+    checks = [
+        (invalid_shape, lambda i: f"Invalid shape '{shapes[i]}'"),
+        (missing_d1, lambda i: "dimension1 required"),
+        (missing_d2, lambda i: f"dimension2 required for {shapes[i]}"),
+        (~np.isfinite(area), lambda i: "Result out of range"),
+    ]
+    error_mask = np.zeros(size, dtype=bool)
+    errors = []
+    for failed, message in checks:
+        new = failed & ~error_mask
+        errors.extend({"index": int(i), "error": message(i)} for i in np.flatnonzero(new))
+        error_mask |= new
+
+    return {
+        "count": size,
+        "area": [None if failed else value for value, failed in zip(area.tolist(), error_mask.tolist())],
+        "error_mask": error_mask.tolist(),
+        "errors": sorted(errors, key=lambda e: e["index"]),
+    }
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    if "--stdio" in sys.argv:
+        # python -m mcp_servers.mcp_areacalc --stdio : JSON-RPC over stdin/stdout
+        from mcp_servers.stdio_server import serve_stdio
+        serve_stdio(app)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8002)
 
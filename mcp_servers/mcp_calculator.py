@@ -1,8 +1,15 @@
 # file: mcp_math_calculator.py
 
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Literal
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Dict, List, Literal
+import ast
+import hashlib
+import json
+import sys
+import math
+import operator
 import uvicorn
 
 app = FastAPI(title="Math Calculator MCP Server")
@@ -12,19 +19,51 @@ class MathRequest(BaseModel):
     num1: float
     num2: float
 
+class BatchRequest(BaseModel):
+    items: List[Dict[str, Any]]
+
+class ExpressionRequest(BaseModel):
+    expression: str = Field(..., max_length=500, description="Arithmetic expression, e.g. (3+4)*(5-2)/7")
+
+MANIFEST = {
+    "name": "Math Calculator MCP Server",
+    "version": "1.0",
+    "actions": [
+        {
+            "name": "process",
+            "description": "Perform basic math operations",
+            "deterministic": True,
+            "cache_ttl": 3600,
+            "input_model": MathRequest.schema()
+        },
+        {
+            "name": "process_batch",
+            "description": "Perform several basic math operations in one call",
+            "batch_for": "process",
+            "max_batch_size": 100,
+            "input_model": BatchRequest.schema()
+        },
+        {
+            "name": "evaluate",
+            "description": (
+                "Evaluate a whole arithmetic expression in one call, e.g. (3+4)*(5-2)/7. "
+                "Supports numbers, parentheses, + - * / // % ** and unary minus"
+            ),
+            "deterministic": True,
+            "cache_ttl": 3600,
+            "input_model": ExpressionRequest.schema()
+        }
+    ]
+}
+MANIFEST_ETAG = '"' + hashlib.sha256(json.dumps(MANIFEST, sort_keys=True).encode()).hexdigest()[:16] + '"'
+
 @app.get("/manifest.json")
-async def manifest():
-    return {
-        "name": "Math Calculator MCP Server",
-        "version": "1.0",
-        "actions": [
-            {
-                "name": "process",
-                "description": "Perform basic math operations",
-                "input_model": MathRequest.schema()
-            }
-        ]
-    }
+async def manifest(request: Request):
+    # Let clients revalidate with If-None-Match instead of re-downloading
+    if_none_match = request.headers.get("if-none-match", "")
+    if MANIFEST_ETAG in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": MANIFEST_ETAG})
+    return JSONResponse(MANIFEST, headers={"ETag": MANIFEST_ETAG})
 
 @app.post("/process")
 async def process_math(req: MathRequest):
@@ -40,5 +79,85 @@ async def process_math(req: MathRequest):
         return {"result": req.num1 / req.num2}
     return {"error": "Invalid operation"}
 
+# Whitelisted syntax for /evaluate; the expression is parsed, never passed to eval()
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+MAX_EXPRESSION_NODES = 200
+MAX_EXPONENT = 1000
+MAX_INT_BITS = 4096
+
+class ExpressionError(ValueError):
+    pass
+
+def _evaluate_node(node):
+    if isinstance(node, ast.Expression):
+        return _evaluate_node(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        return UNARY_OPERATORS[type(node.op)](_evaluate_node(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        left, right = _evaluate_node(node.left), _evaluate_node(node.right)
+        if isinstance(node.op, ast.Pow):
+            if abs(right) > MAX_EXPONENT:
+                raise ExpressionError(f"Exponent larger than {MAX_EXPONENT}")
+            # Refuse huge integer powers before computing them
+            if isinstance(left, int) and isinstance(right, int) and left.bit_length() * right > MAX_INT_BITS:
+                raise ExpressionError("Result out of range")
+        result = BINARY_OPERATORS[type(node.op)](left, right)
+        if isinstance(result, int) and result.bit_length() > MAX_INT_BITS:
+            raise ExpressionError("Result out of range")
+        if isinstance(result, complex):
+            raise ExpressionError("Result is not a real number")
+        return result
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+def evaluate_expression(expression: str):
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        raise ExpressionError("Invalid expression")
+    if sum(1 for _ in ast.walk(tree)) > MAX_EXPRESSION_NODES:
+        raise ExpressionError("Expression too long")
+    result = _evaluate_node(tree)
+    if isinstance(result, float) and not math.isfinite(result):
+        raise ExpressionError("Result out of range")
+    return result
+
+@app.post("/evaluate")
+async def evaluate(req: ExpressionRequest):
+    try:
+        return {"result": evaluate_expression(req.expression)}
+    except ZeroDivisionError:
+        return {"error": "Division by zero"}
+    except OverflowError:
+        return {"error": "Result out of range"}
+    except ExpressionError as e:
+        return {"error": str(e)}
+
+@app.post("/process_batch")
+async def process_math_batch(req: BatchRequest):
+    # Items are validated one by one so a bad item only fails its own slot
+    results = []
+    for item in req.items:
+        try:
+            results.append(await process_math(MathRequest(**item)))
+        except ValidationError as e:
+            results.append({"error": str(e)})
+    return {"results": results}
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    if "--stdio" in sys.argv:
+        # python -m mcp_servers.mcp_calculator --stdio : JSON-RPC over stdin/stdout
+        from mcp_servers.stdio_server import serve_stdio
+        serve_stdio(app)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,74 @@
+# file: stdio_server.py
+#
+# Line-delimited JSON-RPC 2.0 entry point shared by the MCP servers (``--stdio``).
+# Each request line {"id", "method", "params"} is dispatched to the FastAPI app
+# in process: method "manifest" reads /manifest.json, any other method is POSTed
+# to /<method> with params as the body. Responses are written as they complete,
+# so requests from one client are served concurrently and may finish out of order.
+
+import asyncio
+import json
+import sys
+
+import httpx
+
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+def _write(message):
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def _error(request_id, code, message):
+    _write({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+
+async def _handle(client: httpx.AsyncClient, line: bytes):
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return _error(None, -32700, "Parse error")
+    request_id = request.get("id")
+    method = request.get("method")
+    if not isinstance(method, str) or not method:
+        return _error(request_id, -32600, "Invalid request")
+
+    try:
+        if method == "manifest":
+            resp = await client.get("/manifest.json")
+        else:
+            resp = await client.post(f"/{method}", json=request.get("params") or {})
+    except Exception as e:
+        return _error(request_id, -32603, f"Internal error: {e}")
+
+    if resp.status_code in (404, 405):
+        return _error(request_id, -32601, f"Method not found: {method}")
+    if resp.status_code == 422:
+        return _error(request_id, -32602, f"Invalid params: {resp.text}")
+    if resp.status_code >= 400:
+        return _error(request_id, -32603, f"Internal error: HTTP {resp.status_code}")
+    _write({"jsonrpc": "2.0", "id": request_id, "result": resp.json()})
+
+
+async def _serve(app):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=LINE_LIMIT)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    tasks = set()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://stdio.local") as client:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.create_task(_handle(client, line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+
+def serve_stdio(app):
+    """Serve ``app`` over stdin/stdout until stdin is closed."""
+    asyncio.run(_serve(app))